@@ -5,25 +5,27 @@ Main entry point for the application
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, font
 import sys
 import os
+import threading
+from contextlib import contextmanager
 
 # Add the project root to the Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from src.database.database_manager import DatabaseManager
-from src.ui.login_window import LoginWindow
-from src.ui.admin_dashboard import AdminDashboard
 from src.config.config import Config
 
 class DropBillingApp:
-    def __init__(self):
+    def __init__(self, fast_start: bool = False):
+        # Fast start skips centering, styling and config file I/O and opens the
+        # database only when it is first needed (smoke tests, packaged cold starts)
+        self.fast_start = fast_start
+        
         self.root = tk.Tk()
         self.root.title("DROP - Dress for Less")
         
         # Make window responsive and full-screen friendly
-        self.root.geometry("1000x700")
         self.root.resizable(True, True)
         
         # Set minimum window size
@@ -32,53 +34,169 @@ class DropBillingApp:
         # Add window state management
         self.root.state('normal')  # Ensure window is not maximized initially
         
-        # Center window on screen
-        self.center_window()
+        # Size and center window on screen
+        self.center_window(1000, 700)
         
-        # Bind resize event for responsive behavior
+        # Bind resize event for responsive behavior (debounced, see on_window_resize)
+        self._resize_after_id = None
+        self._last_w = None
+        self._last_h = None
         self.root.bind('<Configure>', self.on_window_resize)
         
-        # Initialize database
-        self.db_manager = DatabaseManager()
-        self.db_manager.initialize_database()
+        # Closing the window goes through cleanup so the database is closed (and optimized)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Open and initialize the database in the background while the first
+        # window renders; _get_db() waits for it on first real use
+        self.db_manager = None
+        self._db_error = None
+        self._db_ready = threading.Event()
+        self._db_thread = None
+        if not fast_start:
+            self._db_thread = threading.Thread(target=self._init_db, daemon=True)
+            self._db_thread.start()
         
         # Initialize config
-        self.config = Config()
+        self.config = Config(persist=not fast_start)
         
-        # Initialize dashboard reference
+        # Initialize dashboard references
         self.admin_dashboard = None
+        self.staff_dashboard = None
+        
+        # Every screen is built inside this frame so switching screens is a single destroy
+        self._screen_container = ttk.Frame(self.root)
+        self._screen_container.pack(fill=tk.BOTH, expand=True)
+        
+        # The selection screen is built once and re-packed when revisited
+        self._selection_frame = None
         
         # Set application icon and styling
         self.setup_styling()
         
+        # Persist config changes made through Config.set shortly after the first one
+        self._config_flush_job = None
+        self.config.on_dirty = self._schedule_config_flush
+        
         # Show main selection window
         self.show_main_selection()
     
-    def center_window(self):
-        """Center the window on the screen"""
-        self.root.update_idletasks()
-        width = self.root.winfo_width()
-        height = self.root.winfo_height()
-        x = (self.root.winfo_screenwidth() // 2) - (width // 2)
-        y = (self.root.winfo_screenheight() // 2) - (height // 2)
+    def _init_db(self):
+        """Create and initialize the database manager (runs on a worker thread)"""
+        try:
+            from src.database.database_manager import DatabaseManager
+            db_manager = DatabaseManager.get_instance()
+            if not db_manager.initialize_database():
+                raise RuntimeError("database tables could not be created")
+            self.db_manager = db_manager
+        except Exception as e:
+            print(f"Database initialization error: {e}")
+            self._db_error = e
+        finally:
+            self._db_ready.set()
+    
+    def _wait_db(self):
+        """Block until background database initialization has finished"""
+        if self._db_thread is not None and not self._db_ready.is_set():
+            self._db_ready.wait()
+    
+    def _get_db(self):
+        """Return the database manager, waiting for initialization if needed"""
+        if self._db_thread is None and not self._db_ready.is_set():
+            # Fast start: initialize on first real use
+            self._init_db()
+        self._wait_db()
+        if self.db_manager is None:
+            # Report why the database is missing instead of handing None to the screens
+            raise RuntimeError(f"Database initialization failed: {self._db_error}")
+        return self.db_manager
+    
+    def _schedule_config_flush(self):
+        """Write config changes out in one go a moment after they start"""
+        if self._config_flush_job is None:
+            self._config_flush_job = self.root.after(2000, self._flush_config)
+    
+    def _flush_config(self):
+        """Write pending config changes to file"""
+        self._config_flush_job = None
+        self.config.flush()
+    
+    def _new_screen(self, show=True):
+        """Replace the current screen container with an empty one"""
+        self._screen_container.destroy()
+        self._screen_container = ttk.Frame(self.root)
+        # The window geometry is set explicitly, so children must not resize the container
+        self._screen_container.pack_propagate(False)
+        if show:
+            # Hide (but keep) the cached selection screen
+            if self._selection_frame is not None:
+                self._selection_frame.pack_forget()
+            self._screen_container.pack(fill=tk.BOTH, expand=True)
+        return self._screen_container
+    
+    @contextmanager
+    def _screen_swap(self):
+        """Hide the window while a screen is rebuilt so Tk lays it out and paints it once"""
+        self.root.withdraw()
+        try:
+            yield
+            self.root.update_idletasks()
+        finally:
+            self.root.deiconify()
+    
+    def center_window(self, width, height):
+        """Size the window and center it on the screen in one geometry call"""
+        if self.fast_start:
+            self.root.geometry(f"{width}x{height}")
+            return
+        x = (self.root.winfo_screenwidth() - width) // 2
+        y = (self.root.winfo_screenheight() - height) // 2
         self.root.geometry(f"{width}x{height}+{x}+{y}")
     
     def on_window_resize(self, event):
         """Handle window resize events for responsive behavior"""
-        if event.widget == self.root:
-            # Update window title to show current size (optional, for debugging)
-            current_size = f"{event.width}x{event.height}"
-            if hasattr(self, 'admin_dashboard') and self.admin_dashboard:
-                # Handle admin dashboard resize
-                pass
-            elif hasattr(self, 'staff_dashboard') and self.staff_dashboard:
-                # Handle staff dashboard resize
-                pass
+        if event.widget is not self.root:
+            return
+        
+        # Tk also sends Configure for moves and restacking - ignore those
+        if event.width == self._last_w and event.height == self._last_h:
+            return
+        self._last_w, self._last_h = event.width, event.height
+        
+        # Coalesce a drag into a single resize once events go quiet for 100ms
+        if self._resize_after_id:
+            self.root.after_cancel(self._resize_after_id)
+        self._resize_after_id = self.root.after(
+            100, lambda w=event.width, h=event.height: self._do_resize(w, h)
+        )
+    
+    def _do_resize(self, width, height):
+        """Apply a (debounced) window resize to the active dashboard"""
+        self._resize_after_id = None
+        if self.admin_dashboard is not None:
+            # Handle admin dashboard resize
+            pass
+        elif self.staff_dashboard is not None:
+            # Handle staff dashboard resize
+            pass
         
     def setup_styling(self):
         """Setup application styling and theme"""
         self.root.configure(bg='#f0f0f0')
         
+        # Named fonts are resolved once and referenced by name from widgets
+        # (keep the Font objects alive, Tk deletes them when they are collected)
+        self._fonts = [
+            font.Font(root=self.root, name="TitleFont", family="Arial", size=36, weight="bold"),
+            font.Font(root=self.root, name="SubtitleFont", family="Arial", size=16, slant="italic"),
+            font.Font(root=self.root, name="InfoFont", family="Arial", size=10),
+        ]
+        
+        # Single shared style object for the application
+        self.style = ttk.Style(self.root)
+        if not self.fast_start:
+            colors = self.config.get_theme_colors()
+            self.style.configure("Accent.TButton", background=colors['accent'], foreground='white')
+        
         # Set window icon (you can add an icon file later)
         try:
             # self.root.iconbitmap('assets/icon.ico')  # Uncomment when icon is available
@@ -89,88 +207,98 @@ class DropBillingApp:
     def show_main_selection(self):
         """Show main selection window"""
         try:
-            # Clear any existing widgets
-            for widget in self.root.winfo_children():
-                widget.destroy()
-            
-            # Update window title and size - make it more responsive
-            self.root.title("DROP - Dress for Less")
-            self.root.geometry("600x450")
-            self.root.resizable(True, True)
-            self.root.minsize(500, 400)
-            
-            # Center window
-            self.center_window()
-            
-            # Main frame
-            main_frame = ttk.Frame(self.root, padding="40")
-            main_frame.pack(fill=tk.BOTH, expand=True)
-            
-            # Header
-            header_frame = ttk.Frame(main_frame)
-            header_frame.pack(pady=(0, 50))
-            
-            title_label = ttk.Label(
-                header_frame,
-                text="DROP",
-                font=("Arial", 36, "bold")
-            )
-            title_label.pack()
-            
-            subtitle_label = ttk.Label(
-                header_frame,
-                text="DRESS FOR LESS",
-                font=("Arial", 16, "italic")
-            )
-            subtitle_label.pack()
-            
-            # Selection frame
-            selection_frame = ttk.LabelFrame(main_frame, text="Select Access Type", padding="30")
-            selection_frame.pack(fill=tk.BOTH, expand=True)
-            
-            # Admin button
-            admin_button = ttk.Button(
-                selection_frame,
-                text="ADMIN LOGIN",
-                command=self.open_admin_login,
-                width=25,
-                style="Accent.TButton"
-            )
-            admin_button.pack(pady=(0, 20))
-            
-            # Staff button
-            staff_button = ttk.Button(
-                selection_frame,
-                text="STAFF BILLING",
-                command=self.open_staff_billing,
-                width=25
-            )
-            staff_button.pack()
-            
-            # Info label
-            info_label = ttk.Label(
-                selection_frame,
-                text="Admin: Manage items, settings, and reports\nStaff: Process sales and generate bills",
-                font=("Arial", 10),
-                foreground="gray",
-                justify=tk.CENTER
-            )
-            info_label.pack(pady=(20, 0))
+            with self._screen_swap():
+                # Drop the previous screen; the selection screen lives outside the container
+                self._new_screen(show=False)
+                
+                # Update window title and size - make it more responsive
+                self.root.title("DROP - Dress for Less")
+                self.root.resizable(True, True)
+                self.root.minsize(500, 400)
+                
+                # Size and center window
+                self.center_window(600, 450)
+                
+                if self._selection_frame is None:
+                    self._selection_frame = self._build_selection_frame()
+                self._selection_frame.pack(fill=tk.BOTH, expand=True)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open selection window: {str(e)}")
     
+    def _build_selection_frame(self):
+        """Build the main selection screen"""
+        # Bind widget classes and constants to locals for the build
+        _Frame, _Label, _Button, _LabelFrame = ttk.Frame, ttk.Label, ttk.Button, ttk.LabelFrame
+        _BOTH, _CENTER = tk.BOTH, tk.CENTER
+        
+        # Main frame
+        main_frame = _Frame(self.root, padding="40")
+        
+        # Header
+        header_frame = _Frame(main_frame)
+        header_frame.pack(pady=(0, 50))
+        
+        title_label = _Label(
+            header_frame,
+            text="DROP",
+            font="TitleFont"
+        )
+        title_label.pack()
+        
+        subtitle_label = _Label(
+            header_frame,
+            text="DRESS FOR LESS",
+            font="SubtitleFont"
+        )
+        subtitle_label.pack()
+        
+        # Selection frame
+        selection_frame = _LabelFrame(main_frame, text="Select Access Type", padding="30")
+        selection_frame.pack(fill=_BOTH, expand=True)
+        
+        # Admin button
+        admin_button = _Button(
+            selection_frame,
+            text="ADMIN LOGIN",
+            command=self.open_admin_login,
+            width=25,
+            style="Accent.TButton"
+        )
+        admin_button.pack(pady=(0, 20))
+        
+        # Staff button
+        staff_button = _Button(
+            selection_frame,
+            text="STAFF BILLING",
+            command=self.open_staff_billing,
+            width=25
+        )
+        staff_button.pack()
+        
+        # Info label
+        info_label = _Label(
+            selection_frame,
+            text="Admin: Manage items, settings, and reports\nStaff: Process sales and generate bills",
+            font="InfoFont",
+            foreground="gray",
+            justify=_CENTER
+        )
+        info_label.pack(pady=(20, 0))
+        
+        return main_frame
+    
     def open_admin_login(self):
         """Open admin login window"""
         try:
-            # Clear main window
-            for widget in self.root.winfo_children():
-                widget.destroy()
-            
-            # Create login window
-            from src.ui.login_window import LoginWindow
-            self.login_window = LoginWindow(self.root, self.db_manager, self.config)
-            self.login_window.set_login_success_callback(self.on_admin_login_success)
+            with self._screen_swap():
+                # Swap in a fresh screen container
+                container = self._new_screen()
+                
+                # Create login window
+                from src.ui.login_window import LoginWindow
+                self.login_window = LoginWindow(self.root, self._get_db(), self.config, parent=container)
+                self.login_window.set_login_success_callback(self.on_admin_login_success)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open admin login: {str(e)}")
@@ -178,20 +306,20 @@ class DropBillingApp:
     def on_admin_login_success(self, user):
         """Handle successful admin login"""
         try:
-            # Clear login window
-            for widget in self.root.winfo_children():
-                widget.destroy()
-            
-            # Make window larger for admin dashboard
-            self.root.geometry("1200x800")
-            self.center_window()
-            
-            # Show admin dashboard with reference to main app
-            self.admin_dashboard = AdminDashboard(self.root, self.db_manager, self.config, user)
-            # Store reference to main app in the dashboard
-            self.admin_dashboard.main_app = self
-            # Pack the admin dashboard to make it visible
-            self.admin_dashboard.pack(fill=tk.BOTH, expand=True)
+            with self._screen_swap():
+                # Swap in a fresh screen container
+                container = self._new_screen()
+                
+                # Make window larger for admin dashboard
+                self.center_window(1200, 800)
+                
+                # Show admin dashboard with reference to main app
+                from src.ui.admin_dashboard import AdminDashboard
+                self.admin_dashboard = AdminDashboard(self.root, self._get_db(), self.config, user, parent=container, lazy=True, style=self.style)
+                # Store reference to main app in the dashboard
+                self.admin_dashboard.main_app = self
+                # Pack the admin dashboard to make it visible
+                self.admin_dashboard.pack(fill=tk.BOTH, expand=True)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open admin dashboard: {str(e)}")
@@ -199,34 +327,33 @@ class DropBillingApp:
     def open_staff_billing(self):
         """Open staff billing interface directly"""
         try:
-            # Create a default staff user object
-            staff_user = {
-                'id': 1,
-                'username': 'staff',
-                'user_type': 'staff',
-                'last_login': None
-            }
-            
-            # Clear main window
-            for widget in self.root.winfo_children():
-                widget.destroy()
-            
-            # Update window title and size - make it much larger for full visibility
-            self.root.title("DROP - Staff Billing")
-            self.root.geometry("1600x1000")
-            self.root.resizable(True, True)
-            self.root.minsize(1200, 800)
-            
-            # Center window
-            self.center_window()
-            
-            # Create staff dashboard with reference to main app
-            from src.ui.staff_dashboard import StaffDashboard
-            self.staff_dashboard = StaffDashboard(self.root, self.db_manager, self.config, staff_user)
-            # Store reference to main app in the dashboard
-            self.staff_dashboard.main_app = self
-            # Pack the staff dashboard to make it visible
-            self.staff_dashboard.pack(fill=tk.BOTH, expand=True)
+            with self._screen_swap():
+                # Create a default staff user object
+                staff_user = {
+                    'id': 1,
+                    'username': 'staff',
+                    'user_type': 'staff',
+                    'last_login': None
+                }
+                
+                # Swap in a fresh screen container
+                container = self._new_screen()
+                
+                # Update window title and size - make it much larger for full visibility
+                self.root.title("DROP - Staff Billing")
+                self.root.resizable(True, True)
+                self.root.minsize(1200, 800)
+                
+                # Size and center window
+                self.center_window(1600, 1000)
+                
+                # Create staff dashboard with reference to main app
+                from src.ui.staff_dashboard import StaffDashboard
+                self.staff_dashboard = StaffDashboard(container, self._get_db(), self.config, staff_user, lazy=True)
+                # Store reference to main app in the dashboard
+                self.staff_dashboard.main_app = self
+                # Pack the staff dashboard to make it visible
+                self.staff_dashboard.pack(fill=tk.BOTH, expand=True)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open staff billing: {str(e)}")
@@ -242,16 +369,23 @@ class DropBillingApp:
             messagebox.showerror("Error", f"An unexpected error occurred: {str(e)}")
             self.cleanup()
     
+    def on_close(self):
+        """Release resources and close the main window"""
+        self.cleanup()
+        self.root.destroy()
+    
     def cleanup(self):
         """Cleanup resources before closing"""
-        if hasattr(self, 'db_manager'):
+        self.config.flush()
+        self._wait_db()
+        if self.db_manager is not None:
             self.db_manager.close()
         self.root.quit()
 
 def main():
     """Main function to start the application"""
     try:
-        app = DropBillingApp()
+        app = DropBillingApp(fast_start="--fast-start" in sys.argv[1:])
         app.run()
     except Exception as e:
         print(f"Failed to start application: {str(e)}")
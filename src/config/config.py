@@ -4,18 +4,79 @@ Configuration Manager for DROP Clothing Shop Billing Application
 Handles application settings and theme management
 """
 
-import os
 import json
-from typing import Dict, Any
+import atexit
+from types import MappingProxyType
+from typing import Dict, Any, Callable, Mapping, Optional
+
+# Use orjson for config load/save when it is installed, stdlib json otherwise
+try:
+    import orjson
+    
+    def _dumps(data: Dict[str, Any]) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+    
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(data: Dict[str, Any]) -> bytes:
+        return json.dumps(data, indent=4, sort_keys=True).encode('utf-8')
+    
+    _loads = json.loads
+
+# Theme palettes are shared read-only between all callers
+_DARK_THEME = MappingProxyType({
+    "bg_primary": "#2b2b2b",
+    "bg_secondary": "#3c3c3c",
+    "bg_tertiary": "#4a4a4a",
+    "text_primary": "#ffffff",
+    "text_secondary": "#cccccc",
+    "accent": "#007acc",
+    "accent_hover": "#005a9e",
+    "success": "#28a745",
+    "warning": "#ffc107",
+    "danger": "#dc3545",
+    "border": "#555555"
+})
+
+_LIGHT_THEME = MappingProxyType({
+    "bg_primary": "#ffffff",
+    "bg_secondary": "#f8f9fa",
+    "bg_tertiary": "#e9ecef",
+    "text_primary": "#212529",
+    "text_secondary": "#6c757d",
+    "accent": "#007bff",
+    "accent_hover": "#0056b3",
+    "success": "#28a745",
+    "warning": "#ffc107",
+    "danger": "#dc3545",
+    "border": "#dee2e6"
+})
 
 class Config:
-    def __init__(self):
+    def __init__(self, persist: bool = True):
         self.config_file = "config.json"
-        self.config_data = self.load_config()
+        # When persist is False the defaults are kept in memory and the file is never touched
+        self._persist = persist
+        self._last_hash = None
+        
+        # Bumped on every change so cached read-only views can be invalidated
+        self._version = 0
+        self._shop_info_cache = None
+        
+        self.config_data = self.load_config() if persist else self.default_config()
+        
+        # set() only marks the config dirty; flush() writes it out
+        self._dirty = False
+        # Called when the config first becomes dirty, so the owner can schedule one flush
+        self.on_dirty: Optional[Callable[[], None]] = None
+        if persist:
+            self._last_hash = hash(self._serialize(self.config_data))
+            atexit.register(self.flush)
     
-    def load_config(self) -> Dict[str, Any]:
-        """Load configuration from file or create default"""
-        default_config = {
+    @staticmethod
+    def default_config() -> Dict[str, Any]:
+        """Return a fresh copy of the default configuration"""
+        return {
             "theme": "light",
             "window_width": 1200,
             "window_height": 800,
@@ -29,21 +90,24 @@ class Config:
                 "email": ""
             }
         }
+    
+    def load_config(self) -> Dict[str, Any]:
+        """Load configuration from file or create default"""
+        default_config = self.default_config()
         
-        if os.path.exists(self.config_file):
-            try:
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-                    # Merge with default to ensure all keys exist
-                    for key, value in default_config.items():
-                        if key not in config:
-                            config[key] = value
-                    return config
-            except (json.JSONDecodeError, IOError):
-                return default_config
-        else:
+        try:
+            with open(self.config_file, 'rb') as f:
+                config = _loads(f.read())
+        except FileNotFoundError:
             self.save_config(default_config)
             return default_config
+        except (json.JSONDecodeError, IOError):
+            return default_config
+        
+        # Merge with default to ensure all keys exist, including nested shop_info keys
+        merged = {**default_config, **config}
+        merged["shop_info"] = {**default_config["shop_info"], **config.get("shop_info", {})}
+        return merged
     
     def save_config(self, config_data: Dict[str, Any] = None) -> bool:
         """Save configuration to file"""
@@ -51,16 +115,34 @@ class Config:
             if config_data is None:
                 config_data = self.config_data
             
-            with open(self.config_file, 'w') as f:
-                json.dump(config_data, f, indent=4)
+            if not self._persist:
+                self.config_data = config_data
+                self._dirty = False
+                self._version += 1
+                return True
+            
+            # Skip the write when the file already holds this exact content
+            payload = self._serialize(config_data)
+            payload_hash = hash(payload)
+            if payload_hash != self._last_hash:
+                with open(self.config_file, 'wb') as f:
+                    f.write(payload)
+                self._last_hash = payload_hash
             
             self.config_data = config_data
+            self._dirty = False
+            self._version += 1
             return True
             
         except (IOError, TypeError) as e:
             print(f"Error saving config: {e}")
             return False
     
+    @staticmethod
+    def _serialize(config_data: Dict[str, Any]) -> bytes:
+        """Serialize configuration the way it is stored on disk"""
+        return _dumps(config_data)
+    
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value"""
         return self.config_data.get(key, default)
@@ -69,43 +151,25 @@ class Config:
         """Set configuration value"""
         try:
             self.config_data[key] = value
-            return self.save_config()
+            was_dirty = self._dirty
+            self._dirty = True
+            self._version += 1
+            if not was_dirty and self.on_dirty is not None:
+                self.on_dirty()
+            return True
         except Exception as e:
             print(f"Error setting config: {e}")
             return False
     
-    def get_theme_colors(self) -> Dict[str, str]:
+    def flush(self) -> bool:
+        """Write pending configuration changes to file"""
+        if not self._dirty:
+            return True
+        return self.save_config()
+    
+    def get_theme_colors(self) -> Mapping[str, str]:
         """Get theme colors based on current theme"""
-        theme = self.get("theme", "light")
-        
-        if theme == "dark":
-            return {
-                "bg_primary": "#2b2b2b",
-                "bg_secondary": "#3c3c3c",
-                "bg_tertiary": "#4a4a4a",
-                "text_primary": "#ffffff",
-                "text_secondary": "#cccccc",
-                "accent": "#007acc",
-                "accent_hover": "#005a9e",
-                "success": "#28a745",
-                "warning": "#ffc107",
-                "danger": "#dc3545",
-                "border": "#555555"
-            }
-        else:  # light theme
-            return {
-                "bg_primary": "#ffffff",
-                "bg_secondary": "#f8f9fa",
-                "bg_tertiary": "#e9ecef",
-                "text_primary": "#212529",
-                "text_secondary": "#6c757d",
-                "accent": "#007bff",
-                "accent_hover": "#0056b3",
-                "success": "#28a745",
-                "warning": "#ffc107",
-                "danger": "#dc3545",
-                "border": "#dee2e6"
-            }
+        return _DARK_THEME if self.get("theme", "light") == "dark" else _LIGHT_THEME
     
     def toggle_theme(self) -> str:
         """Toggle between light and dark theme"""
@@ -114,9 +178,11 @@ class Config:
         self.set("theme", new_theme)
         return new_theme
     
-    def get_shop_info(self) -> Dict[str, str]:
-        """Get shop information"""
-        return self.get("shop_info", {})
+    def get_shop_info(self) -> Mapping[str, str]:
+        """Get shop information (read-only view, cached until the config changes)"""
+        if self._shop_info_cache is None or self._shop_info_cache[0] != self._version:
+            self._shop_info_cache = (self._version, MappingProxyType(self.get("shop_info", {})))
+        return self._shop_info_cache[1]
     
     def set_shop_info(self, shop_info: Dict[str, str]) -> bool:
         """Set shop information"""
@@ -6,104 +6,369 @@ Handles all database operations including users, items, and bills
 
 import sqlite3
 import hashlib
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional
+from functools import wraps
+from itertools import groupby
+from pathlib import Path
+from typing import Iterator, List, Dict, Optional
+
+# Schema: every table and index the application needs
+_SCHEMA_SQL = '''
+-- Create users table
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT UNIQUE NOT NULL,
+    password_hash TEXT NOT NULL,
+    user_type TEXT NOT NULL CHECK (user_type IN ('admin', 'staff')),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_login TIMESTAMP
+);
+
+-- Create items table
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    item_code TEXT UNIQUE NOT NULL,
+    item_name TEXT NOT NULL,
+    price REAL NOT NULL,
+    qr_code_path TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Create bills table
+CREATE TABLE IF NOT EXISTS bills (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    bill_number TEXT UNIQUE NOT NULL,
+    total_amount REAL NOT NULL,
+    payment_method TEXT NOT NULL CHECK (payment_method IN ('cash', 'upi', 'card')),
+    staff_username TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Create bill_items table (many-to-many relationship)
+CREATE TABLE IF NOT EXISTS bill_items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    bill_id INTEGER NOT NULL,
+    item_id INTEGER NOT NULL,
+    quantity INTEGER NOT NULL,
+    unit_price REAL NOT NULL,
+    total_price REAL NOT NULL,
+    FOREIGN KEY (bill_id) REFERENCES bills (id) ON DELETE CASCADE,
+    FOREIGN KEY (item_id) REFERENCES items (id) ON DELETE CASCADE
+);
+
+-- Create settings table
+CREATE TABLE IF NOT EXISTS settings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    setting_key TEXT UNIQUE NOT NULL,
+    setting_value TEXT NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Create shop_info table
+CREATE TABLE IF NOT EXISTS shop_info (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    shop_name TEXT NOT NULL DEFAULT 'DROP',
+    tagline TEXT NOT NULL DEFAULT 'DRESS FOR LESS',
+    address TEXT NOT NULL DEFAULT 'City center, Naikkanal, Thrissur, Kerala 680001',
+    phone TEXT,
+    email TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Create bill_counters table (last issued bill sequence per day)
+CREATE TABLE IF NOT EXISTS bill_counters (
+    day TEXT PRIMARY KEY,
+    next_seq INTEGER NOT NULL
+);
+
+-- Index the columns used for date filtering and bill/item joins
+CREATE INDEX IF NOT EXISTS idx_bills_created_at ON bills(created_at);
+CREATE INDEX IF NOT EXISTS idx_bill_items_bill_id ON bill_items(bill_id);
+CREATE INDEX IF NOT EXISTS idx_bill_items_item_id ON bill_items(item_id);
+'''
+
+# Statements on the hot paths, built once at import time
+_SQL_GET_ITEM_BY_CODE = '''
+    SELECT id, item_code, item_name, price, qr_code_path
+    FROM items
+    WHERE item_code = ?
+'''
+
+_SQL_INSERT_BILL = '''
+    INSERT INTO bills (bill_number, total_amount, payment_method, staff_username, created_at)
+    VALUES (?, ?, ?, ?, DATETIME('now', 'localtime'))
+'''
+
+# Line totals are computed by SQLite from quantity and unit price
+_SQL_INSERT_BILL_ITEM = '''
+    INSERT INTO bill_items (bill_id, item_id, quantity, unit_price, total_price)
+    VALUES (?1, ?2, ?3, ?4, ?3 * ?4)
+'''
+
+_SQL_BILLS_BY_DATE_RANGE = '''
+    SELECT b.id, b.bill_number, b.total_amount, b.payment_method,
+           b.staff_username, b.created_at
+    FROM bills b
+    WHERE b.created_at >= ? AND b.created_at < DATE(?, '+1 day')
+    ORDER BY b.created_at DESC
+'''
+
+# Keyset pagination: ?3/?4 are the (created_at, id) of the previous page's last bill
+_SQL_BILLS_PAGE = '''
+    SELECT b.id, b.bill_number, b.total_amount, b.payment_method,
+           b.staff_username, b.created_at,
+           printf('₹%.2f', b.total_amount) AS total_display,
+           upper(b.payment_method) AS payment_display
+    FROM bills b
+    WHERE b.created_at >= ?1 AND b.created_at < DATE(?2, '+1 day')
+      AND (?3 IS NULL OR (b.created_at, b.id) < (?3, ?4))
+    ORDER BY b.created_at DESC, b.id DESC
+    LIMIT ?5
+'''
+
+_SQL_GET_BILL_WITH_ITEMS = '''
+    SELECT b.id, b.bill_number, b.total_amount, b.payment_method,
+           b.staff_username, b.created_at,
+           bi.quantity, bi.unit_price, bi.total_price,
+           i.item_code, i.item_name
+    FROM bills b
+    LEFT JOIN bill_items bi ON bi.bill_id = b.id
+    LEFT JOIN items i ON i.id = bi.item_id
+    WHERE b.id = ?
+    ORDER BY i.item_name
+'''
+
+_SQL_GET_BILL_WITH_ITEMS_BY_NUMBER = '''
+    SELECT b.id, b.bill_number, b.total_amount, b.payment_method,
+           b.staff_username, b.created_at,
+           bi.quantity, bi.unit_price, bi.total_price,
+           i.item_code, i.item_name
+    FROM bills b
+    LEFT JOIN bill_items bi ON bi.bill_id = b.id
+    LEFT JOIN items i ON i.id = bi.item_id
+    WHERE b.bill_number = ?
+    ORDER BY i.item_name
+'''
+
+_SQL_NEXT_BILL_SEQ = '''
+    INSERT INTO bill_counters (day, next_seq) VALUES (DATE('now', 'localtime'), 1)
+    ON CONFLICT(day) DO UPDATE SET next_seq = next_seq + 1
+    RETURNING day, next_seq
+'''
+
+_SQL_PEEK_BILL_SEQ = '''
+    SELECT DATE('now', 'localtime'),
+           COALESCE((SELECT next_seq FROM bill_counters WHERE day = DATE('now', 'localtime')), 0) + 1
+'''
+
+_SQL_BILLS_WITH_ITEMS = '''
+    SELECT b.id, b.bill_number, b.total_amount, b.payment_method,
+           b.staff_username, b.created_at,
+           bi.quantity, bi.unit_price, bi.total_price,
+           i.item_code, i.item_name
+    FROM bills b
+    LEFT JOIN bill_items bi ON bi.bill_id = b.id
+    LEFT JOIN items i ON i.id = bi.item_id
+    WHERE b.created_at >= ? AND b.created_at < DATE(?, '+1 day')
+    ORDER BY b.created_at DESC, b.id DESC, i.item_name
+'''
+
+_SQL_GET_SETTING = 'SELECT setting_value FROM settings WHERE setting_key = ?'
+
+# Dashboard and billing history refresh queries, shared by get_all_items,
+# get_dashboard_snapshot and get_sales_total so each is parsed once per connection
+_SQL_ALL_ITEMS = '''
+    SELECT id, item_code, item_name, price, qr_code_path, created_at
+    FROM items
+    ORDER BY item_name
+'''
+
+_SQL_COUNT_ITEMS = 'SELECT COUNT(*) FROM items'
+
+_SQL_SALES_TOTAL = '''
+    SELECT COALESCE(SUM(total_amount), 0), COUNT(*)
+    FROM bills
+    WHERE created_at >= ? AND created_at < DATE(?, '+1 day')
+'''
+
+_SQL_SALES_TODAY_AND_MONTH = '''
+    SELECT COALESCE(SUM(CASE WHEN created_at >= ? THEN total_amount END), 0),
+           COALESCE(SUM(total_amount), 0)
+    FROM bills
+    WHERE created_at >= ? AND created_at < DATE(?, '+1 day')
+'''
+
+_SQL_RECENT_BILLS = '''
+    SELECT b.id, b.bill_number, b.total_amount, b.payment_method,
+           b.staff_username, b.created_at
+    FROM bills b
+    WHERE b.created_at >= COALESCE(?, '')
+    ORDER BY b.created_at DESC
+    LIMIT ?
+'''
+
+_BILL_COLUMNS = ('id', 'bill_number', 'total_amount', 'payment_method', 'staff_username', 'created_at')
+_BILL_ITEM_COLUMNS = ('quantity', 'unit_price', 'total_price', 'item_code', 'item_name')
+
+def _bill_from_rows(rows: List[sqlite3.Row]) -> Dict:
+    """Rebuild a bill dict with its items from the rows of a bills/bill_items/items join"""
+    first = rows[0]
+    bill = {key: first[key] for key in _BILL_COLUMNS}
+    # Bills without items (or whose items were deleted) get an empty list
+    bill['items'] = [
+        {key: row[key] for key in _BILL_ITEM_COLUMNS}
+        for row in rows if row['item_code'] is not None
+    ]
+    return bill
+
+def _with_retry(fn, retries: int = 5, base: float = 0.005):
+    """Call fn(), retrying with exponential backoff while the database is locked or busy"""
+    for attempt in range(retries):
+        try:
+            return fn()
+        except sqlite3.OperationalError as e:
+            message = str(e).lower()
+            if attempt == retries - 1 or ('locked' not in message and 'busy' not in message):
+                raise
+            time.sleep(base * 2 ** attempt + random.uniform(0, base))
+
+def _serialized_write(method):
+    """Run a write method while holding the manager's writer lock"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._write_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
 
 class DatabaseManager:
+    AUTH_CACHE_TTL = 300  # seconds
+    BILLS_RANGE_CACHE_SIZE = 32
+    
+    _instance = None
+    _instance_lock = threading.Lock()
+    
     def __init__(self, db_path: str = "drop_billing.db"):
         self.db_path = db_path
         self.connection = None
+        
+        # One writer connection guarded by a lock, plus pooled reader connections
+        self._write_lock = threading.RLock()
+        self._reader_pool = queue.Queue()
+        
+        # (username, password_hash) -> (verified_at, user) for recently verified logins
+        self._auth_cache: Dict[tuple, tuple] = {}
+        
+        # (start_date, end_date) -> (bills_version, rows) for recently listed date ranges
+        self._bills_range_cache: Dict[tuple, tuple] = {}
+        
+        # Bumped whenever bills, items or shop info change, so callers can cache derived data
+        self.bills_version = 0
+        self.items_version = 0
+        self.shop_info_version = 0
+    
+    @classmethod
+    def get_instance(cls, db_path: str = "drop_billing.db") -> "DatabaseManager":
+        """Return the process-wide manager, creating it on first use"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(db_path)
+            return cls._instance
     
     def connect(self):
-        """Establish database connection"""
+        """Establish database connection (reused for the lifetime of the manager)"""
+        if self.connection is not None:
+            return True
+        
         try:
-            self.connection = sqlite3.connect(self.db_path)
+            # The connection may be opened on a worker thread and used from the Tk thread
+            self.connection = sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,
+                cached_statements=256
+            )
             self.connection.row_factory = sqlite3.Row
+            self._apply_pragmas()
             return True
         except sqlite3.Error as e:
             print(f"Database connection error: {e}")
             return False
     
+    def _apply_pragmas(self, conn: sqlite3.Connection = None, reader: bool = False):
+        """Tune a connection for a single-user desktop workload"""
+        conn = conn or self.connection
+        if self.db_path != ":memory:":
+            if not reader:
+                # WAL lets reads run alongside writes and needs one fsync per commit
+                # instead of two; the mode is stored in the database file itself
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA wal_autocheckpoint=1000")
+            conn.execute("PRAGMA mmap_size=268435456")
+        # Let SQLite wait for a competing lock before raising SQLITE_BUSY
+        conn.execute("PRAGMA busy_timeout=5000")
+        # NORMAL is durable across application crashes in WAL mode
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")
+    
+    def _open_reader(self) -> sqlite3.Connection:
+        """Open a read-only connection used only for SELECT queries"""
+        # mode=ro opens with SQLITE_OPEN_READONLY, so readers never take write locks
+        uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        self._apply_pragmas(conn, reader=True)
+        return conn
+    
+    @contextmanager
+    def _acquire_reader(self):
+        """Borrow a pooled reader connection for the duration of a query"""
+        if self.connection is None:
+            self.connect()
+        
+        # Every :memory: connection is a separate database, so share the writer
+        if self.db_path == ":memory:":
+            with self._write_lock:
+                yield self.connection
+            return
+        
+        try:
+            conn = self._reader_pool.get_nowait()
+        except queue.Empty:
+            conn = self._open_reader()
+        try:
+            yield conn
+        finally:
+            self._reader_pool.put(conn)
+    
+    @_serialized_write
     def initialize_database(self):
         """Initialize database with all required tables"""
         if not self.connect():
             return False
         
         try:
-            cursor = self.connection.cursor()
-            
-            # Create users table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    username TEXT UNIQUE NOT NULL,
-                    password_hash TEXT NOT NULL,
-                    user_type TEXT NOT NULL CHECK (user_type IN ('admin', 'staff')),
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    last_login TIMESTAMP
-                )
-            ''')
+            # Create all tables and indexes in one transaction
+            self.connection.executescript("BEGIN;" + _SCHEMA_SQL + "COMMIT;")
             
-            # Create items table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS items (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    item_code TEXT UNIQUE NOT NULL,
-                    item_name TEXT NOT NULL,
-                    price REAL NOT NULL,
-                    qr_code_path TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Create bills table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS bills (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    bill_number TEXT UNIQUE NOT NULL,
-                    total_amount REAL NOT NULL,
-                    payment_method TEXT NOT NULL CHECK (payment_method IN ('cash', 'upi', 'card')),
-                    staff_username TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Create bill_items table (many-to-many relationship)
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS bill_items (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    bill_id INTEGER NOT NULL,
-                    item_id INTEGER NOT NULL,
-                    quantity INTEGER NOT NULL,
-                    unit_price REAL NOT NULL,
-                    total_price REAL NOT NULL,
-                    FOREIGN KEY (bill_id) REFERENCES bills (id) ON DELETE CASCADE,
-                    FOREIGN KEY (item_id) REFERENCES items (id) ON DELETE CASCADE
-                )
-            ''')
+            cursor = self.connection.cursor()
             
-            # Create settings table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS settings (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    setting_key TEXT UNIQUE NOT NULL,
-                    setting_value TEXT NOT NULL,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
+            # Refresh planner statistics on every start so they follow the real table
+            # sizes; the analysis limit samples each index, keeping this cheap on large files
+            cursor.execute("PRAGMA analysis_limit=400")
+            cursor.execute("ANALYZE")
             
-            # Create shop_info table
+            # Seed today's counter from existing bills so numbering carries on
             cursor.execute('''
-                CREATE TABLE IF NOT EXISTS shop_info (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    shop_name TEXT NOT NULL DEFAULT 'DROP',
-                    tagline TEXT NOT NULL DEFAULT 'DRESS FOR LESS',
-                    address TEXT NOT NULL DEFAULT 'City center, Naikkanal, Thrissur, Kerala 680001',
-                    phone TEXT,
-                    email TEXT,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
+                INSERT OR IGNORE INTO bill_counters (day, next_seq)
+                SELECT DATE('now', 'localtime'), COUNT(*) FROM bills
+                WHERE created_at >= DATE('now', 'localtime')
+                  AND created_at < DATE('now', 'localtime', '+1 day')
             ''')
             
             self.connection.commit()
@@ -166,11 +431,20 @@ class DatabaseManager:
         except sqlite3.Error as e:
             print(f"Error creating default shop info: {e}")
     
+    @_serialized_write
     def authenticate_user(self, username: str, password: str) -> Optional[Dict]:
         """Authenticate user login"""
+        # hashlib dispatches to OpenSSL, which uses the CPU's SHA extensions where available
+        password_hash = hashlib.sha256(password.encode()).hexdigest()
+        cache_key = (username, password_hash)
+        
+        # Skip the database for logins verified within the TTL
+        cached = self._auth_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < self.AUTH_CACHE_TTL:
+            return dict(cached[1])
+        
         try:
             cursor = self.connection.cursor()
-            password_hash = hashlib.sha256(password.encode()).hexdigest()
             
             cursor.execute('''
                 SELECT id, username, user_type, last_login
@@ -187,6 +461,7 @@ class DatabaseManager:
                 ''', (user['id'],))
                 self.connection.commit()
                 
+                self._auth_cache[cache_key] = (time.monotonic(), dict(user))
                 return dict(user)
             return None
             
@@ -194,6 +469,7 @@ class DatabaseManager:
             print(f"Authentication error: {e}")
             return None
     
+    @_serialized_write
     def add_item(self, item_code: str, item_name: str, price: float, qr_code_path: str = None) -> bool:
         """Add new item to inventory"""
         try:
@@ -204,24 +480,40 @@ class DatabaseManager:
             ''', (item_code, item_name, price, qr_code_path))
             
             self.connection.commit()
+            self.items_version += 1
             return True
             
         except sqlite3.Error as e:
             print(f"Error adding item: {e}")
             return False
     
-    def get_all_items(self) -> List[Dict]:
-        """Get all items from inventory"""
+    @_serialized_write
+    def add_items_bulk(self, items: List[tuple]) -> int:
+        """Add many (item_code, item_name, price, qr_code_path) rows in one transaction"""
         try:
-            cursor = self.connection.cursor()
-            cursor.execute('''
-                SELECT id, item_code, item_name, price, qr_code_path, created_at
-                FROM items
-                ORDER BY item_name
-            ''')
+            with self.connection:
+                cursor = self.connection.executemany('''
+                    INSERT INTO items (item_code, item_name, price, qr_code_path)
+                    VALUES (?, ?, ?, ?)
+                ''', items)
             
-            return [dict(row) for row in cursor.fetchall()]
+            self.items_version += 1
+            return cursor.rowcount
             
+        except sqlite3.Error as e:
+            print(f"Error adding items: {e}")
+            return 0
+    
+    def get_all_items(self) -> List[sqlite3.Row]:
+        """Get all items from inventory"""
+        try:
+            with self._acquire_reader() as conn:
+                cursor = conn.cursor()
+                cursor.execute(_SQL_ALL_ITEMS)
+                
+                # Rows support item["column"] access, which is all callers need
+                return cursor.fetchall()
+                
         except sqlite3.Error as e:
             print(f"Error getting items: {e}")
             return []
@@ -229,20 +521,18 @@ class DatabaseManager:
     def get_item_by_code(self, item_code: str) -> Optional[Dict]:
         """Get item by item code"""
         try:
-            cursor = self.connection.cursor()
-            cursor.execute('''
-                SELECT id, item_code, item_name, price, qr_code_path
-                FROM items
-                WHERE item_code = ?
-            ''', (item_code,))
-            
-            row = cursor.fetchone()
-            return dict(row) if row else None
-            
+            with self._acquire_reader() as conn:
+                cursor = conn.cursor()
+                cursor.execute(_SQL_GET_ITEM_BY_CODE, (item_code,))
+                
+                row = cursor.fetchone()
+                return dict(row) if row else None
+                
         except sqlite3.Error as e:
             print(f"Error getting item by code: {e}")
             return None
     
+    @_serialized_write
     def update_item(self, item_id: int, item_code: str, item_name: str, price: float, qr_code_path: str = None) -> bool:
         """Update existing item"""
         try:
@@ -260,116 +550,232 @@ class DatabaseManager:
             print(f"Error updating item: {e}")
             return False
     
+    @_serialized_write
+    def upsert_item(self, item_code: str, item_name: str, price: float, qr_code_path: str = None) -> bool:
+        """Insert an item, or update the existing item with the same code"""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute('''
+                INSERT INTO items (item_code, item_name, price, qr_code_path)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(item_code) DO UPDATE
+                SET item_name = excluded.item_name, price = excluded.price,
+                    qr_code_path = excluded.qr_code_path, updated_at = CURRENT_TIMESTAMP
+            ''', (item_code, item_name, price, qr_code_path))
+            
+            self.connection.commit()
+            self.items_version += 1
+            return True
+            
+        except sqlite3.Error as e:
+            print(f"Error upserting item: {e}")
+            return False
+    
+    @_serialized_write
     def delete_item(self, item_id: int) -> bool:
         """Delete item from inventory"""
         try:
             cursor = self.connection.cursor()
             cursor.execute('DELETE FROM items WHERE id = ?', (item_id,))
             self.connection.commit()
+            self.items_version += 1
             return True
             
         except sqlite3.Error as e:
             print(f"Error deleting item: {e}")
             return False
     
-    def create_bill(self, bill_number: str, items: List[Dict], total_amount: float, payment_method: str, staff_username: str) -> bool:
-        """Create new bill with items"""
-        try:
+    @_serialized_write
+    def create_bill(self, bill_number: Optional[str], items: List[Dict], total_amount: float, payment_method: str, staff_username: str) -> Optional[str]:
+        """Create new bill with items and return its bill number, or None on failure
+        
+        With no bill_number, the next number is taken from today's counter in the
+        same transaction, so a failed bill leaves no gap in the sequence.
+        """
+        def insert_bill():
             cursor = self.connection.cursor()
             
-            # Use exact system time
-            current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            # Insert bill with exact system time
-            cursor.execute('''
-                INSERT INTO bills (bill_number, total_amount, payment_method, staff_username, created_at)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (bill_number, total_amount, payment_method, staff_username, current_time))
-            
-            bill_id = cursor.lastrowid
-            
-            # Insert bill items
-            for item in items:
-                cursor.execute('''
-                    INSERT INTO bill_items (bill_id, item_id, quantity, unit_price, total_price)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (bill_id, item['item_id'], item['quantity'], item['unit_price'], item['total_price']))
+            # Number, bill and items are committed together, or rolled back together on error
+            with self.connection:
+                number = bill_number or self._allocate_bill_number(cursor)
+                
+                # Insert bill stamped with SQLite's local system time
+                cursor.execute(_SQL_INSERT_BILL, (number, total_amount, payment_method, staff_username))
+                
+                bill_id = cursor.lastrowid
+                
+                # Insert bill items
+                rows = [(bill_id, item['item_id'], item['quantity'], item['unit_price']) for item in items]
+                cursor.executemany(_SQL_INSERT_BILL_ITEM, rows)
             
-            self.connection.commit()
-            return True
+            return number
+        
+        try:
+            # A transaction that lost a lock race is rolled back and retried as a whole
+            number = _with_retry(insert_bill)
+            self.bills_version += 1
+            return number
             
         except sqlite3.Error as e:
             print(f"Error creating bill: {e}")
-            return False
+            return None
     
-    def get_bills_by_date_range(self, start_date: str, end_date: str) -> List[Dict]:
+    def get_bills_by_date_range(self, start_date: str, end_date: str) -> List[sqlite3.Row]:
         """Get bills within date range"""
+        # Reuse the rows from an earlier call unless bills have changed since
+        cache_key = (start_date, end_date)
+        version = self.bills_version
+        cached = self._bills_range_cache.get(cache_key)
+        if cached and cached[0] == version:
+            return list(cached[1])
+        
         try:
-            cursor = self.connection.cursor()
-            cursor.execute('''
-                SELECT b.id, b.bill_number, b.total_amount, b.payment_method, 
-                       b.staff_username, b.created_at
-                FROM bills b
-                WHERE DATE(b.created_at) BETWEEN ? AND ?
-                ORDER BY b.created_at DESC
-            ''', (start_date, end_date))
-            
-            return [dict(row) for row in cursor.fetchall()]
-            
+            with self._acquire_reader() as conn:
+                cursor = conn.cursor()
+                cursor.execute(_SQL_BILLS_BY_DATE_RANGE, (start_date, end_date))
+                
+                # Rows support item["column"] access; callers still get a list they can sort and index
+                bills = cursor.fetchall()
+            
+            # Drop the oldest range once the cache is full
+            if cache_key not in self._bills_range_cache and len(self._bills_range_cache) >= self.BILLS_RANGE_CACHE_SIZE:
+                self._bills_range_cache.pop(next(iter(self._bills_range_cache)), None)
+            self._bills_range_cache[cache_key] = (version, tuple(bills))
+            return bills
+                
         except sqlite3.Error as e:
             print(f"Error getting bills by date range: {e}")
             return []
     
+    def yield_bills_by_date_range(self, start_date: str, end_date: str, chunk_size: int = 1000) -> Iterator[List[sqlite3.Row]]:
+        """Yield bills within date range in chunks of up to chunk_size rows, holding one reader until done"""
+        try:
+            with self._acquire_reader() as conn:
+                cursor = conn.cursor()
+                cursor.execute(_SQL_BILLS_BY_DATE_RANGE, (start_date, end_date))
+                
+                try:
+                    while True:
+                        rows = cursor.fetchmany(chunk_size)
+                        if not rows:
+                            break
+                        yield rows
+                finally:
+                    # Reset the statement if the caller stopped early, so the pooled
+                    # reader does not keep its read snapshot open
+                    cursor.close()
+                
+        except sqlite3.Error as e:
+            print(f"Error streaming bills by date range: {e}")
+    
+    def get_bills_page(self, start_date: str, end_date: str, after: Optional[tuple] = None, limit: int = 200) -> List[sqlite3.Row]:
+        """Get one page of bills within date range, newest first, starting after the (created_at, id) of the previous page's last bill"""
+        try:
+            after_created_at, after_id = after if after else (None, None)
+            with self._acquire_reader() as conn:
+                cursor = conn.cursor()
+                cursor.execute(_SQL_BILLS_PAGE, (start_date, end_date, after_created_at, after_id, limit))
+                
+                return cursor.fetchall()
+                
+        except sqlite3.Error as e:
+            print(f"Error getting bills page: {e}")
+            return []
+    
+    def get_dashboard_snapshot(self, today: str, month_start: str, recent_since: str, recent_limit: int = 10) -> Dict:
+        """Get item count, today's and month's sales and recent bills using one connection"""
+        try:
+            with self._acquire_reader() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute(_SQL_COUNT_ITEMS)
+                total_items = cursor.fetchone()[0]
+                
+                # Today's and month's sales in one pass over the month's bills
+                cursor.execute(_SQL_SALES_TODAY_AND_MONTH, (today, month_start, today))
+                today_sales, month_sales = cursor.fetchone()
+                
+                cursor.execute(_SQL_RECENT_BILLS, (recent_since, recent_limit))
+                recent_bills = cursor.fetchall()
+                
+                return {
+                    'total_items': total_items,
+                    'today_sales': today_sales,
+                    'month_sales': month_sales,
+                    'recent_bills': recent_bills
+                }
+                
+        except sqlite3.Error as e:
+            print(f"Error getting dashboard snapshot: {e}")
+            return {'total_items': 0, 'today_sales': 0, 'month_sales': 0, 'recent_bills': []}
+    
     def get_bill_details(self, bill_id: int) -> Optional[Dict]:
         """Get detailed bill information including items"""
+        return self._fetch_bill_details(_SQL_GET_BILL_WITH_ITEMS, bill_id)
+    
+    def get_bill_details_by_number(self, bill_number: str) -> Optional[Dict]:
+        """Get detailed bill information including items, looked up by bill number"""
+        return self._fetch_bill_details(_SQL_GET_BILL_WITH_ITEMS_BY_NUMBER, bill_number)
+    
+    def _fetch_bill_details(self, sql: str, key) -> Optional[Dict]:
+        """Run one of the bill-with-items queries and rebuild the bill dict"""
         try:
-            cursor = self.connection.cursor()
-            
-            # Get bill info
-            cursor.execute('''
-                SELECT b.id, b.bill_number, b.total_amount, b.payment_method,
-                       b.staff_username, b.created_at
-                FROM bills b
-                WHERE b.id = ?
-            ''', (bill_id,))
-            
-            bill = cursor.fetchone()
-            if not bill:
-                return None
-            
-            # Get bill items
-            cursor.execute('''
-                SELECT bi.quantity, bi.unit_price, bi.total_price,
-                       i.item_code, i.item_name
-                FROM bill_items bi
-                JOIN items i ON bi.item_id = i.id
-                WHERE bi.bill_id = ?
-                ORDER BY i.item_name
-            ''', (bill_id,))
-            
-            items = [dict(row) for row in cursor.fetchall()]
-            
-            bill_dict = dict(bill)
-            bill_dict['items'] = items
-            
-            return bill_dict
-            
+            with self._acquire_reader() as conn:
+                cursor = conn.cursor()
+                
+                # Bill header and items in one query; the header repeats on every item row
+                cursor.execute(sql, (key,))
+                
+                rows = cursor.fetchall()
+                if not rows:
+                    return None
+                
+                return _bill_from_rows(rows)
+                
         except sqlite3.Error as e:
             print(f"Error getting bill details: {e}")
             return None
     
+    def get_sales_total(self, start_date: str, end_date: str) -> tuple:
+        """Get (sales total, bill count) within date range"""
+        try:
+            with self._acquire_reader() as conn:
+                cursor = conn.cursor()
+                cursor.execute(_SQL_SALES_TOTAL, (start_date, end_date))
+                
+                return tuple(cursor.fetchone())
+                
+        except sqlite3.Error as e:
+            print(f"Error getting sales total: {e}")
+            return (0, 0)
+    
+    def get_bills_with_items(self, start_date: str, end_date: str) -> List[Dict]:
+        """Get bills within date range, each with its items, using a single query"""
+        try:
+            with self._acquire_reader() as conn:
+                cursor = conn.cursor()
+                cursor.execute(_SQL_BILLS_WITH_ITEMS, (start_date, end_date))
+                
+                return [_bill_from_rows(list(rows)) for _, rows in groupby(cursor, key=lambda row: row['id'])]
+                
+        except sqlite3.Error as e:
+            print(f"Error getting bills with items: {e}")
+            return []
+    
     def get_setting(self, key: str) -> Optional[str]:
         """Get application setting"""
         try:
-            cursor = self.connection.cursor()
-            cursor.execute('SELECT setting_value FROM settings WHERE setting_key = ?', (key,))
-            row = cursor.fetchone()
-            return row['setting_value'] if row else None
-            
+            with self._acquire_reader() as conn:
+                cursor = conn.cursor()
+                cursor.execute(_SQL_GET_SETTING, (key,))
+                row = cursor.fetchone()
+                return row['setting_value'] if row else None
+                
         except sqlite3.Error as e:
             print(f"Error getting setting: {e}")
             return None
     
+    @_serialized_write
     def set_setting(self, key: str, value: str) -> bool:
         """Set application setting"""
         try:
@@ -389,15 +795,17 @@ class DatabaseManager:
     def get_shop_info(self) -> Dict:
         """Get shop information"""
         try:
-            cursor = self.connection.cursor()
-            cursor.execute('SELECT * FROM shop_info LIMIT 1')
-            row = cursor.fetchone()
-            return dict(row) if row else {}
-            
+            with self._acquire_reader() as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT * FROM shop_info LIMIT 1')
+                row = cursor.fetchone()
+                return dict(row) if row else {}
+                
         except sqlite3.Error as e:
             print(f"Error getting shop info: {e}")
             return {}
     
+    @_serialized_write
     def update_shop_info(self, shop_name: str, tagline: str, address: str, phone: str = None, email: str = None) -> bool:
         """Update shop information"""
         try:
@@ -408,63 +816,82 @@ class DatabaseManager:
             ''', (shop_name, tagline, address, phone, email))
             
             self.connection.commit()
+            self.shop_info_version += 1
             return True
             
         except sqlite3.Error as e:
             print(f"Error updating shop info: {e}")
             return False
     
+    @_serialized_write
     def get_next_bill_number(self) -> str:
-        """Generate next bill number"""
+        """Get the bill number the next bill will be given (create_bill allocates it)"""
         try:
             cursor = self.connection.cursor()
+            cursor.execute(_SQL_PEEK_BILL_SEQ)
+            day, seq = cursor.fetchone()
             
-            # Use exact system date for consistency
-            today = datetime.now().strftime('%Y-%m-%d')
-            cursor.execute('''
-                SELECT COUNT(*) as count FROM bills
-                WHERE DATE(created_at) = ?
-            ''', (today,))
-            
-            count = cursor.fetchone()['count']
-            today_formatted = datetime.now().strftime('%Y%m%d')
-            return f"BILL{today_formatted}{count + 1:04d}"
+            return f"BILL{day.replace('-', '')}{seq:04d}"
             
         except sqlite3.Error as e:
             print(f"Error generating bill number: {e}")
             return f"BILL{datetime.now().strftime('%Y%m%d')}0001"
     
+    def _allocate_bill_number(self, cursor: sqlite3.Cursor) -> str:
+        """Bump today's bill counter and return the number it gives; runs inside create_bill's transaction"""
+        # Bump today's counter (SQLite's local date, matching bill timestamps)
+        # with a primary-key upsert instead of counting bills
+        if sqlite3.sqlite_version_info >= (3, 35, 0):
+            cursor.execute(_SQL_NEXT_BILL_SEQ)
+        else:
+            # RETURNING needs SQLite 3.35+
+            cursor.execute("SELECT DATE('now', 'localtime')")
+            today = cursor.fetchone()[0]
+            cursor.execute('UPDATE bill_counters SET next_seq = next_seq + 1 WHERE day = ?', (today,))
+            if cursor.rowcount == 0:
+                cursor.execute('INSERT INTO bill_counters (day, next_seq) VALUES (?, 1)', (today,))
+            cursor.execute('SELECT day, next_seq FROM bill_counters WHERE day = ?', (today,))
+        day, seq = cursor.fetchone()
+        
+        return f"BILL{day.replace('-', '')}{seq:04d}"
+    
+    @_serialized_write
     def clear_items(self):
         """Clear all items from database"""
         try:
-            cursor = self.connection.cursor()
-            cursor.execute('DELETE FROM items')
-            self.connection.commit()
+            with self.connection:
+                self.connection.execute('DELETE FROM items')
+            self.items_version += 1
             print("All items cleared from database")
             return True
         except sqlite3.Error as e:
             print(f"Error clearing items: {e}")
             return False
     
+    @_serialized_write
     def clear_bills(self):
         """Clear all bills from database"""
         try:
-            cursor = self.connection.cursor()
-            cursor.execute('DELETE FROM bills')
-            cursor.execute('DELETE FROM bill_items')
-            self.connection.commit()
+            # Unqualified DELETEs use SQLite's truncate optimization; one transaction
+            # means one commit and no half-cleared state if anything fails
+            with self.connection:
+                self.connection.execute('DELETE FROM bill_items')
+                self.connection.execute('DELETE FROM bills')
+                self.connection.execute('DELETE FROM bill_counters')
+            self.bills_version += 1
             print("All bills cleared from database")
             return True
         except sqlite3.Error as e:
             print(f"Error clearing bills: {e}")
             return False
     
+    @_serialized_write
     def clear_users(self):
         """Clear all users except admin"""
         try:
-            cursor = self.connection.cursor()
-            cursor.execute('DELETE FROM users WHERE username != ?', ('admin',))
-            self.connection.commit()
+            with self.connection:
+                self.connection.execute('DELETE FROM users WHERE username != ?', ('admin',))
+            self._auth_cache.clear()
             print("All non-admin users cleared from database")
             return True
         except sqlite3.Error as e:
@@ -481,12 +908,14 @@ class DatabaseManager:
             print(f"Error getting users: {e}")
             return []
     
+    @_serialized_write
     def delete_user(self, user_id):
         """Delete a specific user"""
         try:
             cursor = self.connection.cursor()
             cursor.execute('DELETE FROM users WHERE id = ?', (user_id,))
             self.connection.commit()
+            self._auth_cache.clear()
             return True
         except sqlite3.Error as e:
             print(f"Error deleting user: {e}")
@@ -494,5 +923,16 @@ class DatabaseManager:
     
     def close(self):
         """Close database connection"""
+        while True:
+            try:
+                self._reader_pool.get_nowait().close()
+            except queue.Empty:
+                break
+        
         if self.connection:
+            try:
+                self.connection.execute("PRAGMA optimize")
+            except sqlite3.Error as e:
+                print(f"Error optimizing database: {e}")
             self.connection.close()
+            self.connection = None
@@ -4,9 +4,11 @@ Admin Dashboard for DROP Clothing Shop Billing Application
 Provides admin functionality including settings, item management, and billing history
 """
 
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Dict
+from typing import Dict, Optional
 from datetime import datetime, timedelta
 
 from src.database.database_manager import DatabaseManager
@@ -17,17 +19,41 @@ from src.ui.settings_window import SettingsWindow
 from src.ui.staff_dashboard import StaffDashboard
 
 class AdminDashboard(ttk.Frame):
-    def __init__(self, root: tk.Tk, db_manager: DatabaseManager, config: Config, current_user: Dict):
-        super().__init__(root)
+    def __init__(self, root: tk.Tk, db_manager: DatabaseManager, config: Config, current_user: Dict, parent=None, lazy: bool = False, style: Optional[ttk.Style] = None):
+        super().__init__(parent if parent is not None else root)
         self.root = root
         self.db_manager = db_manager
         self.config = config
         self.current_user = current_user
+        # When lazy, dashboard data is loaded after the widgets have been drawn
+        self.lazy = lazy
+        # (today, first day of month, bills version, items version) -> dashboard snapshot
+        self._stats_cache: Dict[tuple, tuple] = {}
+        # A background stats load is running / another refresh was requested meanwhile
+        self._stats_loading = False
+        self._stats_reload = False
+        # Finished stats loads, handed from the worker thread to the Tk thread
+        self._stats_results = queue.Queue()
+        # Pending after() job for a debounced refresh_data
+        self._refresh_job = None
+        # Delete selection dialog, built on first use and then reused
+        self._delete_dialog = None
+        self._delete_selected_var = None
+        # Main content pages, built on first visit and then shown/hidden
+        self._pages: Dict[str, ttk.Frame] = {}
+        self._current_page = None
+        # The application's shared style object, reused by apply_theme
+        self._style = style if style is not None else ttk.Style(self.root)
+        # Theme name -> ttk style options built from its palette
+        self._theme_styles: Dict[str, Dict[str, Dict[str, str]]] = {}
+        # Statistic widgets, set once the sidebar and overview page are built
+        self.total_items_label = self.today_sales_label = self.month_sales_label = None
+        self.total_items_value = self.today_sales_value = self.month_sales_value = None
+        self.recent_bills_tree = None
         
         self.setup_window()
         self.create_widgets()
         self.apply_theme()
-        self.load_dashboard_data()
     
     def setup_window(self):
         """Setup admin dashboard window"""
@@ -179,56 +205,78 @@ class AdminDashboard(ttk.Frame):
         self.stats_frame = ttk.LabelFrame(sidebar_frame, text="Quick Stats")
         self.stats_frame.pack(fill=tk.X, padx=5, pady=5)
         
-        self.total_items_label = ttk.Label(self.stats_frame, text="Total Items: 0")
+        self.total_items_label = ttk.Label(self.stats_frame, text="Total Items: …")
         self.total_items_label.pack(anchor="w", padx=5, pady=2)
         
-        self.today_sales_label = ttk.Label(self.stats_frame, text="Today's Sales: ₹0")
+        self.today_sales_label = ttk.Label(self.stats_frame, text="Today's Sales: …")
         self.today_sales_label.pack(anchor="w", padx=5, pady=2)
         
-        self.month_sales_label = ttk.Label(self.stats_frame, text="Month's Sales: ₹0")
+        self.month_sales_label = ttk.Label(self.stats_frame, text="Month's Sales: …")
         self.month_sales_label.pack(anchor="w", padx=5, pady=2)
     
+    def _show_page(self, name: str, factory, on_show=None):
+        """Show a cached main content page, creating it on first use"""
+        page = self._pages.get(name)
+        if page is None:
+            page = self._pages[name] = factory()
+        elif on_show is not None:
+            on_show(page)
+        
+        if self._current_page is not page:
+            if self._current_page is not None:
+                self._current_page.pack_forget()
+            page.pack(fill=tk.BOTH, expand=True)
+            self._current_page = page
+    
     def show_dashboard_overview(self):
         """Show dashboard overview content"""
-        # Clear main content
-        for widget in self.main_content.winfo_children():
-            widget.destroy()
+        self._show_page('overview', self._create_overview_page)
+        
+        # Load data
+        if self.lazy:
+            self.after_idle(self.load_dashboard_data)
+        else:
+            self.load_dashboard_data()
+    
+    def _create_overview_page(self) -> ttk.Frame:
+        """Create the dashboard overview widgets"""
+        page = ttk.Frame(self.main_content)
         
         # Overview title
         title_label = ttk.Label(
-            self.main_content,
+            page,
             text="Dashboard Overview",
             font=("Arial", 16, "bold")
         )
         title_label.pack(pady=(0, 20))
         
         # Stats cards
-        stats_frame = ttk.Frame(self.main_content)
+        stats_frame = ttk.Frame(page)
         stats_frame.pack(fill=tk.X, pady=(0, 20))
         
         # Today's sales card
         today_card = ttk.LabelFrame(stats_frame, text="Today's Sales", padding="10")
         today_card.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 10))
         
-        self.today_sales_value = ttk.Label(today_card, text="₹0", font=("Arial", 20, "bold"))
+        self.today_sales_value = ttk.Label(today_card, text="…", font=("Arial", 20, "bold"))
         self.today_sales_value.pack()
         
         # This month's sales card
         month_card = ttk.LabelFrame(stats_frame, text="This Month's Sales", padding="10")
         month_card.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 10))
         
-        self.month_sales_value = ttk.Label(month_card, text="₹0", font=("Arial", 20, "bold"))
+        self.month_sales_value = ttk.Label(month_card, text="…", font=("Arial", 20, "bold"))
         self.month_sales_value.pack()
         
         # Total items card
         items_card = ttk.LabelFrame(stats_frame, text="Total Items", padding="10")
         items_card.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
-        self.total_items_value = ttk.Label(items_card, text="0", font=("Arial", 20, "bold"))
+        self.total_items_value = ttk.Label(items_card, text="…", font=("Arial", 20, "bold"))
         self.total_items_value.pack()
         
         # Recent bills table
-        recent_frame = ttk.LabelFrame(self.main_content, text="Recent Bills", padding="10")
+        recent_frame = ttk.LabelFrame(page, text="Recent Bills", padding="10")
         recent_frame.pack(fill=tk.BOTH, expand=True)
         
         # Create treeview for recent bills
@@ -247,85 +295,128 @@ class AdminDashboard(ttk.Frame):
         self.recent_bills_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        # Load data
-        self.load_dashboard_data()
+        return page
     
     def load_dashboard_data(self):
         """Load dashboard data and statistics"""
+        # Coalesce overlapping refreshes into one more load after the current one
+        if self._stats_loading:
+            self._stats_reload = True
+            return
+        
+        # Get today's date
+        today = datetime.now().strftime('%Y-%m-%d')
+        
+        # Get this month's first day and the start of the recent bills window
+        first_day = datetime.now().replace(day=1).strftime('%Y-%m-%d')
+        week_ago = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
+        
+        # Reuse the last snapshot until bills or items change
+        cache_key = (today, first_day, self.db_manager.bills_version, self.db_manager.items_version)
+        snapshot = self._stats_cache.get(cache_key)
+        if snapshot is not None:
+            self._apply_stats(snapshot)
+            return
+        
+        # Query on a worker thread so the window stays responsive
+        self._stats_loading = True
+        threading.Thread(
+            target=self._load_stats_worker,
+            args=(cache_key, today, first_day, week_ago),
+            daemon=True
+        ).start()
+        self.after(50, self._poll_stats_load)
+    
+    def _load_stats_worker(self, cache_key: tuple, today: str, first_day: str, week_ago: str):
+        """Fetch the dashboard snapshot off the Tk thread"""
+        snapshot = None
         try:
-            # Get total items count
-            items = self.db_manager.get_all_items()
-            total_items = len(items)
-            
-            # Get today's date
-            today = datetime.now().strftime('%Y-%m-%d')
-            
-            # Get this month's date range
-            first_day = datetime.now().replace(day=1).strftime('%Y-%m-%d')
-            last_day = datetime.now().strftime('%Y-%m-%d')
-            
-            # Get today's sales
-            today_bills = self.db_manager.get_bills_by_date_range(today, today)
-            today_sales = sum(bill['total_amount'] for bill in today_bills)
-            
-            # Get month's sales
-            month_bills = self.db_manager.get_bills_by_date_range(first_day, last_day)
-            month_sales = sum(bill['total_amount'] for bill in month_bills)
+            snapshot = self.db_manager.get_dashboard_snapshot(today, first_day, week_ago)
+        except Exception as e:
+            print(f"Error loading dashboard stats: {e}")
+        finally:
+            # Always report back, even on failure, so the loading flag gets cleared
+            self._stats_results.put((cache_key, snapshot))
+    
+    def _poll_stats_load(self):
+        """Pick up a finished stats load on the Tk thread, checking again shortly if none is ready"""
+        try:
+            cache_key, snapshot = self._stats_results.get_nowait()
+        except queue.Empty:
+            self.after(50, self._poll_stats_load)
+            return
+        self._finish_stats_load(cache_key, snapshot)
+    
+    def _finish_stats_load(self, cache_key: tuple, snapshot: Optional[Dict]):
+        """Store a freshly loaded snapshot and show it, or reload if a newer refresh is waiting"""
+        self._stats_loading = False
+        if snapshot is not None:
+            self._stats_cache = {cache_key: snapshot}
+        
+        if self._stats_reload:
+            self._stats_reload = False
+            self.load_dashboard_data()
+        elif snapshot is not None:
+            self._apply_stats(snapshot)
+    
+    def _apply_stats(self, snapshot: Dict):
+        """Show a dashboard snapshot in the overview cards, sidebar and recent bills"""
+        for key in ('total_items', 'today_sales', 'month_sales', 'recent_bills'):
+            self._update_tile(key, snapshot[key])
+    
+    def _update_tile(self, key: str, value):
+        """Update the widgets showing one dashboard statistic"""
+        try:
+            if key == 'total_items':
+                if self.total_items_value is not None:
+                    self.total_items_value.config(text=str(value))
+                if self.total_items_label is not None:
+                    self.total_items_label.config(text=f"Total Items: {value}")
             
-            # Update labels
-            if hasattr(self, 'total_items_value'):
-                self.total_items_value.config(text=str(total_items))
-            if hasattr(self, 'today_sales_value'):
-                self.today_sales_value.config(text=f"₹{today_sales:.2f}")
-            if hasattr(self, 'month_sales_value'):
-                self.month_sales_value.config(text=f"₹{month_sales:.2f}")
+            elif key == 'today_sales':
+                if self.today_sales_value is not None:
+                    self.today_sales_value.config(text=f"₹{value:.2f}")
+                if self.today_sales_label is not None:
+                    self.today_sales_label.config(text=f"Today's Sales: ₹{value:.2f}")
             
-            # Update sidebar stats
-            if hasattr(self, 'total_items_label'):
-                self.total_items_label.config(text=f"Total Items: {total_items}")
-            if hasattr(self, 'today_sales_label'):
-                self.today_sales_label.config(text=f"Today's Sales: ₹{today_sales:.2f}")
-            if hasattr(self, 'month_sales_label'):
-                self.month_sales_label.config(text=f"Month's Sales: ₹{month_sales:.2f}")
+            elif key == 'month_sales':
+                if self.month_sales_value is not None:
+                    self.month_sales_value.config(text=f"₹{value:.2f}")
+                if self.month_sales_label is not None:
+                    self.month_sales_label.config(text=f"Month's Sales: ₹{value:.2f}")
             
-            # Load recent bills
-            if hasattr(self, 'recent_bills_tree'):
-                # Clear existing items
-                for item in self.recent_bills_tree.get_children():
-                    self.recent_bills_tree.delete(item)
+            elif key == 'recent_bills' and self.recent_bills_tree is not None:
+                tree = self.recent_bills_tree
                 
-                # Add recent bills (last 10)
-                recent_bills = self.db_manager.get_bills_by_date_range(
-                    (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d'),
-                    datetime.now().strftime('%Y-%m-%d')
-                )
+                # Format all rows before touching the widget
+                rows = [(
+                    bill['bill_number'],
+                    bill['created_at'][:10],
+                    f"₹{bill['total_amount']:.2f}",
+                    bill['payment_method'].upper(),
+                    bill['staff_username']
+                ) for bill in value]
                 
-                for bill in recent_bills[:10]:  # Show only last 10
-                    self.recent_bills_tree.insert("", "end", values=(
-                        bill['bill_number'],
-                        bill['created_at'][:10],
-                        f"₹{bill['total_amount']:.2f}",
-                        bill['payment_method'].upper(),
-                        bill['staff_username']
-                    ))
+                # Clear existing items with a single Tcl call
+                tree.delete(*tree.get_children())
+                
+                # Add recent bills (last 10 from the past week)
+                insert = tree.insert
+                for index, values in enumerate(rows):
+                    insert("", "end", iid=str(index), values=values)
         
         except Exception as e:
-            print(f"Error loading dashboard data: {e}")
+            print(f"Error loading dashboard data ({key}): {e}")
     
     def open_item_management(self):
         """Open item management window"""
         try:
-            # Clear main content
-            for widget in self.main_content.winfo_children():
-                widget.destroy()
-            
-            # Create item management widget
-            item_management = ItemManagementWindow(
-                self.main_content,
-                self.db_manager,
-                self.config
+            # Create item management widget on first visit, refresh its data on later visits
+            self._show_page(
+                'items',
+                lambda: ItemManagementWindow(self.main_content, self.db_manager, self.config),
+                on_show=lambda page: page.load_items()
             )
-            item_management.pack(fill=tk.BOTH, expand=True)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open item management: {str(e)}")
@@ -333,17 +424,12 @@ class AdminDashboard(ttk.Frame):
     def open_billing_history(self):
         """Open billing history window"""
         try:
-            # Clear main content
-            for widget in self.main_content.winfo_children():
-                widget.destroy()
-            
-            # Create billing history widget
-            billing_history = BillingHistoryWindow(
-                self.main_content,
-                self.db_manager,
-                self.config
+            # Create billing history widget on first visit, refresh its data on later visits
+            self._show_page(
+                'billing_history',
+                lambda: BillingHistoryWindow(self.main_content, self.db_manager, self.config),
+                on_show=lambda page: page.load_bills()
             )
-            billing_history.pack(fill=tk.BOTH, expand=True)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open billing history: {str(e)}")
@@ -351,17 +437,12 @@ class AdminDashboard(ttk.Frame):
     def open_settings(self):
         """Open settings window"""
         try:
-            # Clear main content
-            for widget in self.main_content.winfo_children():
-                widget.destroy()
-            
-            # Create settings widget
-            settings = SettingsWindow(
-                self.main_content,
-                self.db_manager,
-                self.config
+            # Create settings widget on first visit, refresh its data on later visits
+            self._show_page(
+                'settings',
+                lambda: SettingsWindow(self.main_content, self.db_manager, self.config),
+                on_show=lambda page: page.load_settings()
             )
-            settings.pack(fill=tk.BOTH, expand=True)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open settings: {str(e)}")
@@ -377,23 +458,36 @@ class AdminDashboard(ttk.Frame):
     
     def apply_theme(self):
         """Apply current theme to the dashboard"""
+        theme = self.config.get("theme", "light")
         colors = self.config.get_theme_colors()
         
-        # Configure style
-        style = ttk.Style()
-        style.theme_use('clam')
-        
-        # Configure colors
-        style.configure('TFrame', background=colors['bg_primary'])
-        style.configure('TLabel', background=colors['bg_primary'], foreground=colors['text_primary'])
-        style.configure('TLabelFrame', background=colors['bg_primary'], foreground=colors['text_primary'])
-        style.configure('TLabelFrame.Label', background=colors['bg_primary'], foreground=colors['text_primary'])
-        style.configure('TButton', background=colors['accent'], foreground='white')
-        style.configure('Treeview', background=colors['bg_secondary'], foreground=colors['text_primary'])
-        style.configure('Treeview.Heading', background=colors['bg_tertiary'], foreground=colors['text_primary'])
+        # Switch to clam only when some other code has changed the theme
+        style = self._style
+        if style.theme_use() != 'clam':
+            style.theme_use('clam')
+        
+        # Configure colors; the palettes never change, so each theme's style map is built once
+        styles = self._theme_styles.get(theme)
+        if styles is None:
+            styles = self._theme_styles[theme] = {
+                'TFrame': {'background': colors['bg_primary']},
+                'TLabel': {'background': colors['bg_primary'], 'foreground': colors['text_primary']},
+                'TLabelFrame': {'background': colors['bg_primary'], 'foreground': colors['text_primary']},
+                'TLabelFrame.Label': {'background': colors['bg_primary'], 'foreground': colors['text_primary']},
+                'TButton': {'background': colors['accent'], 'foreground': 'white'},
+                'Treeview': {'background': colors['bg_secondary'], 'foreground': colors['text_primary']},
+                'Treeview.Heading': {'background': colors['bg_tertiary'], 'foreground': colors['text_primary']},
+            }
+        
+        # Reconfigure only the styles whose colors changed (other windows share
+        # these styles), since each configure makes every widget using it redraw
+        for name, options in styles.items():
+            if any(style.configure(name, query_opt=key) != value for key, value in options.items()):
+                style.configure(name, **options)
         
         # Apply background color to root
-        self.root.configure(bg=colors['bg_primary'])
+        if self.root.cget('bg') != colors['bg_primary']:
+            self.root.configure(bg=colors['bg_primary'])
     
     def go_back_to_main(self):
         """Go back to main selection window"""
@@ -422,79 +516,98 @@ class AdminDashboard(ttk.Frame):
     def delete_selected_data(self):
         """Delete selected data from database"""
         try:
-            # Show options for what to delete
-            delete_options = [
-                "Selected Items",
-                "Selected Bills", 
-                "Selected Users",
-                "All Items",
-                "All Bills",
-                "All Users"
-            ]
+            # The dialog is built on first use, then hidden and shown again
+            if self._delete_dialog is None or not self._delete_dialog.winfo_exists():
+                self._create_delete_dialog()
+            else:
+                self._delete_selected_var.set("")
+                self._delete_dialog.deiconify()
             
-            # Create a simple dialog to select what to delete
-            dialog = tk.Toplevel(self.root)
-            dialog.title("Delete Selected Data")
-            dialog.geometry("400x300")
-            dialog.transient(self.root)
-            dialog.grab_set()
+            dialog = self._delete_dialog
             
             # Center the dialog
             dialog.update_idletasks()
             x = (dialog.winfo_screenwidth() // 2) - (200)
             y = (dialog.winfo_screenheight() // 2) - (150)
             dialog.geometry(f"400x300+{x}+{y}")
-            
-            ttk.Label(dialog, text="Select data to delete:", font=("Arial", 12, "bold")).pack(pady=10)
-            
-            # Create radio buttons for selection
-            selected_option = tk.StringVar(value="")
-            
-            for option in delete_options:
-                ttk.Radiobutton(
-                    dialog, 
-                    text=option, 
-                    variable=selected_option, 
-                    value=option
-                ).pack(anchor="w", padx=20, pady=5)
-            
-            def confirm_delete():
-                option = selected_option.get()
-                if not option:
-                    messagebox.showwarning("No Selection", "Please select what to delete.")
-                    return
-                
-                # Confirm deletion
-                if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete {option}?\n\nThis action cannot be undone!"):
-                    if option == "All Items":
-                        self.db_manager.clear_items()
-                        messagebox.showinfo("Success", "All items deleted successfully!")
-                    elif option == "All Bills":
-                        self.db_manager.clear_bills()
-                        messagebox.showinfo("Success", "All bills deleted successfully!")
-                    elif option == "All Users":
-                        # Don't delete admin user
-                        users = self.db_manager.get_all_users()
-                        for user in users:
-                            if user['username'] != 'admin':
-                                self.db_manager.delete_user(user['id'])
-                        messagebox.showinfo("Success", "All non-admin users deleted successfully!")
-                    else:
-                        messagebox.showinfo("Info", f"Selected deletion for {option} - implementation needed")
-                    
-                    self.refresh_data()
-                    dialog.destroy()
-            
-            # Buttons
-            button_frame = ttk.Frame(dialog)
-            button_frame.pack(pady=20)
-            
-            ttk.Button(button_frame, text="Delete", command=confirm_delete).pack(side=tk.LEFT, padx=5)
-            ttk.Button(button_frame, text="Cancel", command=dialog.destroy).pack(side=tk.LEFT, padx=5)
+            dialog.lift()
+            dialog.grab_set()
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to delete selected data: {str(e)}")
     
+    def _create_delete_dialog(self):
+        """Build the delete selection dialog"""
+        # Show options for what to delete
+        delete_options = [
+            "Selected Items",
+            "Selected Bills", 
+            "Selected Users",
+            "All Items",
+            "All Bills",
+            "All Users"
+        ]
+        
+        # Create a simple dialog to select what to delete; as a child of the dashboard
+        # it is destroyed along with it instead of outliving the admin session
+        dialog = tk.Toplevel(self)
+        dialog.title("Delete Selected Data")
+        dialog.geometry("400x300")
+        dialog.transient(self.root)
+        dialog.protocol("WM_DELETE_WINDOW", self._hide_delete_dialog)
+        
+        ttk.Label(dialog, text="Select data to delete:", font=("Arial", 12, "bold")).pack(pady=10)
+        
+        # Create radio buttons for selection
+        self._delete_selected_var = tk.StringVar(value="")
+        
+        for option in delete_options:
+            ttk.Radiobutton(
+                dialog, 
+                text=option, 
+                variable=self._delete_selected_var, 
+                value=option
+            ).pack(anchor="w", padx=20, pady=5)
+        
+        # Buttons
+        button_frame = ttk.Frame(dialog)
+        button_frame.pack(pady=20)
+        
+        ttk.Button(button_frame, text="Delete", command=self._confirm_delete_selected).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Cancel", command=self._hide_delete_dialog).pack(side=tk.LEFT, padx=5)
+        
+        self._delete_dialog = dialog
+    
+    def _hide_delete_dialog(self):
+        """Hide the delete selection dialog for reuse"""
+        self._delete_dialog.grab_release()
+        self._delete_dialog.withdraw()
+    
+    def _confirm_delete_selected(self):
+        """Delete the data chosen in the delete selection dialog"""
+        option = self._delete_selected_var.get()
+        if not option:
+            messagebox.showwarning("No Selection", "Please select what to delete.")
+            return
+        
+        # Confirm deletion
+        if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete {option}?\n\nThis action cannot be undone!"):
+            if option == "All Items":
+                self.db_manager.clear_items()
+                messagebox.showinfo("Success", "All items deleted successfully!")
+            elif option == "All Bills":
+                self.db_manager.clear_bills()
+                messagebox.showinfo("Success", "All bills deleted successfully!")
+            elif option == "All Users":
+                # Don't delete admin user
+                self.db_manager.clear_users()
+                messagebox.showinfo("Success", "All non-admin users deleted successfully!")
+            else:
+                messagebox.showinfo("Info", f"Selected deletion for {option} - implementation needed")
+            
+            self._schedule_refresh()
+            self._hide_delete_dialog()
+    
     def delete_all_data(self):
         """Delete all data from database (except admin user)"""
         try:
@@ -521,13 +634,10 @@ Are you absolutely sure you want to continue?
                     self.db_manager.clear_bills()
                     
                     # Delete all users except admin
-                    users = self.db_manager.get_all_users()
-                    for user in users:
-                        if user['username'] != 'admin':
-                            self.db_manager.delete_user(user['id'])
+                    self.db_manager.clear_users()
                     
                     messagebox.showinfo("Success", "✅ All data deleted successfully!\n\nAdmin user preserved.")
-                    self.refresh_data()
+                    self._schedule_refresh()
                     
         except Exception as e:
             messagebox.showerror("Error", f"Failed to delete all data: {str(e)}")
@@ -535,3 +645,14 @@ Are you absolutely sure you want to continue?
     def refresh_data(self):
         """Refresh dashboard data"""
         self.load_dashboard_data()
+    
+    def _schedule_refresh(self):
+        """Refresh dashboard data shortly, coalescing back-to-back requests into one reload"""
+        if self._refresh_job is not None:
+            self.after_cancel(self._refresh_job)
+        self._refresh_job = self.after(150, self._do_refresh)
+    
+    def _do_refresh(self):
+        """Run the refresh scheduled by _schedule_refresh"""
+        self._refresh_job = None
+        self.refresh_data()
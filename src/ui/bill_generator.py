@@ -4,8 +4,16 @@ Bill Generator for DROP Clothing Shop Billing Application
 Generates PDF bills matching the provided format
 """
 
+import hashlib
+import json
 import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from operator import itemgetter
+from typing import List
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
@@ -16,165 +24,294 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from src.database.database_manager import DatabaseManager
 from src.config.config import Config
 
+# Items table header and the bill item fields it shows, in column order
+_ITEMS_HEADER = ['PRODUCT', 'QUANTITY', 'PRICE', 'TOTAL']
+_ITEM_FIELDS = itemgetter('item_name', 'quantity', 'unit_price', 'total_price')
+# Amount as shown in the items table, e.g. Rs.12.50
+_format_rs = "Rs.%.2f".__mod__
+
+# Carbon printer bill layout; only the values filled into these vary per bill
+_CARBON_HEADER = '\n'.join([
+    "=" * 50,
+    "        %s",
+    "      %s",
+    "    %s",
+    "=" * 50,
+    "",
+    "Date: %-20s Bill No: %s",
+    "-" * 50,
+    "",
+    "ITEM NAME                QTY   PRICE    TOTAL",
+    "-" * 50,
+    ""
+])
+# Item names are truncated to 20 characters to fit the carbon printer width
+_CARBON_ITEM_LINE = "%-20.20s %3d  Rs.%6.2f  Rs.%6.2f\n"
+_CARBON_FOOTER = '\n'.join([
+    "-" * 50,
+    "%-40s Rs.%%6.2f" % "TOTAL:",
+    "",
+    "Payment Method: %s",
+    "",
+    "Thank you for shopping with us!",
+    "Visit again soon!",
+    "",
+    "=" * 50
+])
+
+def _format_bill_date(created_at: str) -> str:
+    """Format a 'YYYY-MM-DD HH:MM:SS' timestamp as DD/MM/YYYY for the bill"""
+    # The database always stores this fixed layout, so slicing avoids the strptime parser
+    if len(created_at) >= 10 and created_at[4] == '-' and created_at[7] == '-':
+        return f"{created_at[8:10]}/{created_at[5:7]}/{created_at[0:4]}"
+    return datetime.strptime(created_at, '%Y-%m-%d %H:%M:%S').strftime('%d/%m/%Y')
+
+def _place_cached_pdf(cache_path: str, pdf_path: str):
+    """Point pdf_path at a cached PDF, hard-linking it where possible"""
+    # A per-thread name keeps concurrent reprints of one bill apart
+    tmp_path = f"{pdf_path}.{threading.get_ident()}.tmp"
+    try:
+        os.link(cache_path, tmp_path)
+    except OSError:
+        shutil.copyfile(cache_path, tmp_path)
+    os.replace(tmp_path, pdf_path)
+
 class BillGenerator:
     def __init__(self, db_manager: DatabaseManager, config: Config):
         self.db_manager = db_manager
         self.config = config
         self.carbon_printer_mode = config.get("carbon_printer_mode", False)
+        # Worker threads for background PDF builds, started on first use
+        self._executor = None
+        
+        # Bill header (upper-cased name, upper-cased tagline, address) as of
+        # db_manager.shop_info_version, rebuilt only after shop info changes
+        self._shop_header_cache = None
+        self._shop_info_version = -1
+        # Hash of the shop header; cached PDFs are named after it so entries
+        # rendered with an older header can be found and pruned
+        self._shop_header_key = None
+        # Per-thread shop header and footer flowables; flowables are laid out in
+        # place during a build, so the two PDF worker threads must not share them
+        self._header_local = threading.local()
+        
+        # Create bills directory once rather than on every bill; rendered PDFs are
+        # also linked under _cache by content hash so reprints can skip rendering
+        self._bills_dir = "assets/bills"
+        self._pdf_cache_dir = os.path.join(self._bills_dir, "_cache")
+        try:
+            os.makedirs(self._pdf_cache_dir, exist_ok=True)
+        except OSError as e:
+            print(f"Error creating bills directory: {e}")
+        
+        # PDF styles are the same for every bill, so build them once
+        self._build_styles()
+    
+    def _get_shop_header(self) -> tuple:
+        """Get (shop name, tagline, address) as printed on bills, querying the database only after shop info is updated"""
+        version = self.db_manager.shop_info_version
+        if self._shop_header_cache is None or self._shop_info_version != version:
+            shop_info = self.db_manager.get_shop_info()
+            header = (
+                shop_info.get('shop_name', 'DROP').upper(),
+                shop_info.get('tagline', 'DRESS FOR LESS').upper(),
+                shop_info.get('address', 'City center, Naikkanal, Thrissur, Kerala 680001')
+            )
+            if header != self._shop_header_cache:
+                header_key = hashlib.blake2b(json.dumps(header).encode('utf-8'), digest_size=8).hexdigest()
+                self._prune_pdf_cache(header_key)
+                self._shop_header_key = header_key
+            self._shop_header_cache = header
+            self._shop_info_version = version
+        return self._shop_header_cache
+    
+    def _bill_pdf_key(self, bill_details: dict) -> str:
+        """Hash everything printed on a bill's PDF, so equal keys mean identical PDFs"""
+        self._get_shop_header()
+        payload = json.dumps(bill_details, sort_keys=True, default=str)
+        return f"{self._shop_header_key}-{hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()}"
+    
+    def _prune_pdf_cache(self, header_key: str):
+        """Delete cached PDFs rendered with another shop header, which can no longer be reused"""
+        try:
+            names = os.listdir(self._pdf_cache_dir)
+        except OSError as e:
+            print(f"Error reading bill PDF cache: {e}")
+            return
+        
+        prefix = header_key + "-"
+        for name in names:
+            if not name.startswith(prefix):
+                try:
+                    os.remove(os.path.join(self._pdf_cache_dir, name))
+                except OSError:
+                    pass
+    
+    def _get_header_flowables(self) -> list:
+        """Get this thread's shop header Paragraphs, rebuilt only after shop info changes"""
+        shop_name, shop_tagline, shop_address = self._get_shop_header()
+        local = self._header_local
+        if getattr(local, 'version', None) != self._shop_info_version:
+            local.flowables = [
+                Paragraph(shop_name, self._shop_title_style),
+                Paragraph(shop_tagline, self._shop_subtitle_style),
+                Paragraph(shop_address, self._shop_address_style)
+            ]
+            local.version = self._shop_info_version
+        return local.flowables
+    
+    def _get_footer_flowables(self) -> list:
+        """Get this thread's thank-you footer, which is the same on every bill"""
+        local = self._header_local
+        footer = getattr(local, 'footer', None)
+        if footer is None:
+            footer = local.footer = [
+                Spacer(1, 20),
+                Paragraph("Thank you for shopping with us!", self._payment_style),
+                Paragraph("Visit again soon!", self._payment_style)
+            ]
+        return footer
+    
+    def _build_styles(self):
+        """Create the paragraph and table styles used by generate_bill_pdf"""
+        styles = getSampleStyleSheet()
+        
+        self._shop_title_style = ParagraphStyle(
+            'ShopTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            spaceAfter=6,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Bold'
+        )
+        
+        self._shop_subtitle_style = ParagraphStyle(
+            'ShopSubtitle',
+            parent=styles['Normal'],
+            fontSize=12,
+            spaceAfter=6,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Oblique'
+        )
+        
+        self._shop_address_style = ParagraphStyle(
+            'ShopAddress',
+            parent=styles['Normal'],
+            fontSize=10,
+            spaceAfter=12,
+            alignment=TA_CENTER,
+            fontName='Helvetica'
+        )
+        
+        self._payment_style = ParagraphStyle(
+            'PaymentInfo',
+            parent=styles['Normal'],
+            fontSize=10,
+            spaceAfter=6,
+            alignment=TA_CENTER,
+            fontName='Helvetica'
+        )
+        
+        self._bill_info_table_style = TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('LEFTPADDING', (0, 0), (0, 0), 0),
+            ('RIGHTPADDING', (-1, 0), (-1, 0), 0),
+        ])
+        
+        self._items_table_style = TableStyle([
+            # Header row
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            
+            # Data rows
+            ('BACKGROUND', (0, 1), (-1, -2), colors.beige),
+            ('TEXTCOLOR', (0, 1), (-1, -2), colors.black),
+            ('ALIGN', (0, 1), (-1, -2), 'CENTER'),
+            ('FONTNAME', (0, 1), (-1, -2), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -2), 10),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('VALIGN', (0, 1), (-1, -1), 'MIDDLE'),
+            
+            # Total row
+            ('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey),
+            ('TEXTCOLOR', (0, -1), (-1, -1), colors.black),
+            ('ALIGN', (0, -1), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, -1), (-1, -1), 12),
+            ('TOPPADDING', (0, -1), (-1, -1), 12),
+            ('BOTTOMPADDING', (0, -1), (-1, -1), 12),
+        ])
+    
+    def generate_bill_pdf_async(self, bill_details: dict, callback, widget):
+        """Generate PDF bill in the background and call callback(pdf_path) on the Tk thread (None if it failed)"""
+        future = self._get_executor().submit(self.generate_bill_pdf, bill_details)
+        
+        def poll():
+            # The worker never touches Tk; the widget's thread checks the future instead
+            if not widget.winfo_exists():
+                print("Bill PDF ready but window is gone")
+                return
+            if not future.done():
+                widget.after(50, poll)
+                return
+            callback(future.result() if future.exception() is None else None)
+        
+        widget.after(50, poll)
+        return future
+    
+    def generate_bills_batch(self, bills: List[dict]) -> List[str]:
+        """Generate PDF bills for many bills, returning their paths (None for failures) in order"""
+        # Warm the shop header cache once instead of racing to load it in every worker
+        self._get_shop_header()
+        return list(self._get_executor().map(self.generate_bill_pdf, bills))
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the worker pool for PDF builds, starting it on first use"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="bill-pdf")
+        return self._executor
     
     def generate_bill_pdf(self, bill_details: dict) -> str:
         """Generate PDF bill from bill details"""
         try:
-            # Create bills directory if it doesn't exist
-            bills_dir = "assets/bills"
-            os.makedirs(bills_dir, exist_ok=True)
-            
             # Generate PDF filename
             pdf_filename = f"bill_{bill_details['bill_number']}.pdf"
-            pdf_path = os.path.join(bills_dir, pdf_filename)
-            
-            # Create PDF document
-            doc = SimpleDocTemplate(pdf_path, pagesize=letter)
-            story = []
-            
-            # Get styles
-            styles = getSampleStyleSheet()
-            
-            # Custom styles
-            shop_title_style = ParagraphStyle(
-                'ShopTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                spaceAfter=6,
-                alignment=TA_CENTER,
-                fontName='Helvetica-Bold'
-            )
-            
-            shop_subtitle_style = ParagraphStyle(
-                'ShopSubtitle',
-                parent=styles['Normal'],
-                fontSize=12,
-                spaceAfter=6,
-                alignment=TA_CENTER,
-                fontName='Helvetica-Oblique'
-            )
-            
-            shop_address_style = ParagraphStyle(
-                'ShopAddress',
-                parent=styles['Normal'],
-                fontSize=10,
-                spaceAfter=12,
-                alignment=TA_CENTER,
-                fontName='Helvetica'
-            )
-            
-            bill_info_style = ParagraphStyle(
-                'BillInfo',
-                parent=styles['Normal'],
-                fontSize=10,
-                alignment=TA_LEFT,
-                fontName='Helvetica'
-            )
-            
-            # Get shop info
-            shop_info = self.db_manager.get_shop_info()
-            shop_name = shop_info.get('shop_name', 'DROP')
-            shop_tagline = shop_info.get('tagline', 'DRESS FOR LESS')
-            shop_address = shop_info.get('address', 'City center, Naikkanal, Thrissur, Kerala 680001')
-            
-            # Add shop header
-            story.append(Paragraph(shop_name.upper(), shop_title_style))
-            story.append(Paragraph(shop_tagline.upper(), shop_subtitle_style))
-            story.append(Paragraph(shop_address, shop_address_style))
-            
-            # Add date and bill number
-            bill_date = datetime.strptime(bill_details['created_at'], '%Y-%m-%d %H:%M:%S').strftime('%d/%m/%Y')
-            
-            bill_info_data = [
-                [f"DATE: {bill_date}", f"BILL NO: {bill_details['bill_number']}"]
-            ]
-            
-            bill_info_table = Table(bill_info_data, colWidths=[3*inch, 3*inch])
-            bill_info_table.setStyle(TableStyle([
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('LEFTPADDING', (0, 0), (0, 0), 0),
-                ('RIGHTPADDING', (-1, 0), (-1, 0), 0),
-            ]))
-            
-            story.append(bill_info_table)
-            story.append(Spacer(1, 20))
-            
-            # Create items table
-            table_data = [['PRODUCT', 'QUANTITY', 'PRICE', 'TOTAL']]
-            
-            for item in bill_details['items']:
-                table_data.append([
-                    item['item_name'],
-                    str(item['quantity']),
-                    f"Rs.{item['unit_price']:.2f}",
-                    f"Rs.{item['total_price']:.2f}"
-                ])
-            
-            # Add total row
-            table_data.append([
-                '',
-                '',
-                'TOTAL:',
-                f"Rs.{bill_details['total_amount']:.2f}"
-            ])
-            
-            items_table = Table(table_data, colWidths=[3*inch, 1*inch, 1.5*inch, 1.5*inch])
-            items_table.setStyle(TableStyle([
-                # Header row
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            pdf_path = os.path.join(self._bills_dir, pdf_filename)
+            
+            # Reprints of an unchanged bill reuse the PDF rendered earlier
+            cache_path = os.path.join(self._pdf_cache_dir, f"{self._bill_pdf_key(bill_details)}.pdf")
+            if os.path.exists(cache_path):
+                if not (os.path.exists(pdf_path) and os.path.samefile(pdf_path, cache_path)):
+                    _place_cached_pdf(cache_path, pdf_path)
+                return pdf_path
+            
+            # Build into a private temp file, so a failed or concurrent build never
+            # touches the bill's current PDF (which may also be linked into the cache)
+            fd, tmp_path = tempfile.mkstemp(prefix=pdf_filename + ".", suffix=".tmp", dir=self._bills_dir)
+            os.close(fd)
+            try:
+                # Create PDF document; compressed page streams keep the saved bills small
+                doc = SimpleDocTemplate(tmp_path, pagesize=letter, pageCompression=1)
+                doc.build(self._build_bill_story(bill_details))
                 
-                # Data rows
-                ('BACKGROUND', (0, 1), (-1, -2), colors.beige),
-                ('TEXTCOLOR', (0, 1), (-1, -2), colors.black),
-                ('ALIGN', (0, 1), (-1, -2), 'CENTER'),
-                ('FONTNAME', (0, 1), (-1, -2), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -2), 10),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('VALIGN', (0, 1), (-1, -1), 'MIDDLE'),
+                try:
+                    os.link(tmp_path, cache_path)
+                except OSError:
+                    # Already cached by another build, or links are unsupported here
+                    pass
                 
-                # Total row
-                ('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey),
-                ('TEXTCOLOR', (0, -1), (-1, -1), colors.black),
-                ('ALIGN', (0, -1), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, -1), (-1, -1), 12),
-                ('TOPPADDING', (0, -1), (-1, -1), 12),
-                ('BOTTOMPADDING', (0, -1), (-1, -1), 12),
-            ]))
-            
-            story.append(items_table)
-            story.append(Spacer(1, 30))
-            
-            # Add payment method and thank you message
-            payment_style = ParagraphStyle(
-                'PaymentInfo',
-                parent=styles['Normal'],
-                fontSize=10,
-                spaceAfter=6,
-                alignment=TA_CENTER,
-                fontName='Helvetica'
-            )
-            
-            story.append(Paragraph(f"Payment Method: {bill_details['payment_method'].upper()}", payment_style))
-            story.append(Spacer(1, 20))
-            story.append(Paragraph("Thank you for shopping with us!", payment_style))
-            story.append(Paragraph("Visit again soon!", payment_style))
-            
-            # Build PDF
-            doc.build(story)
+                # Swap the finished PDF in
+                os.replace(tmp_path, pdf_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
             
             return pdf_path
             
@@ -182,66 +319,75 @@ class BillGenerator:
             print(f"Error generating bill PDF: {e}")
             return None
     
+    def _build_bill_story(self, bill_details: dict) -> list:
+        """Build the flowables of a bill's PDF"""
+        story = []
+        
+        # Add shop header
+        story.extend(self._get_header_flowables())
+        
+        # Add date and bill number
+        bill_date = _format_bill_date(bill_details['created_at'])
+        
+        bill_info_data = [
+            [f"DATE: {bill_date}", f"BILL NO: {bill_details['bill_number']}"]
+        ]
+        
+        bill_info_table = Table(bill_info_data, colWidths=[3*inch, 3*inch])
+        bill_info_table.setStyle(self._bill_info_table_style)
+        
+        story.append(bill_info_table)
+        story.append(Spacer(1, 20))
+        
+        # Create items table: header, one row per item, then the total row
+        rows = [
+            [name, str(quantity), _format_rs(unit_price), _format_rs(total_price)]
+            for name, quantity, unit_price, total_price in map(_ITEM_FIELDS, bill_details['items'])
+        ]
+        table_data = [
+            list(_ITEMS_HEADER),
+            *rows,
+            ['', '', 'TOTAL:', _format_rs(bill_details['total_amount'])]
+        ]
+        
+        items_table = Table(table_data, colWidths=[3*inch, 1*inch, 1.5*inch, 1.5*inch])
+        items_table.setStyle(self._items_table_style)
+        
+        story.append(items_table)
+        story.append(Spacer(1, 30))
+        
+        # Add payment method and thank you message
+        payment_style = self._payment_style
+        
+        story.append(Paragraph(f"Payment Method: {bill_details['payment_method'].upper()}", payment_style))
+        story.extend(self._get_footer_flowables())
+        
+        return story
+    
     def generate_carbon_printer_bill(self, bill_details: dict) -> str:
         """Generate carbon printer optimized bill (text format)"""
         try:
-            # Create bills directory if it doesn't exist
-            bills_dir = "assets/bills"
-            os.makedirs(bills_dir, exist_ok=True)
-            
             # Generate text filename for carbon printer
             txt_filename = f"bill_{bill_details['bill_number']}.txt"
-            txt_path = os.path.join(bills_dir, txt_filename)
+            txt_path = os.path.join(self._bills_dir, txt_filename)
             
             # Get shop info
-            shop_info = self.db_manager.get_shop_info()
-            shop_name = shop_info.get('shop_name', 'DROP')
-            shop_tagline = shop_info.get('tagline', 'DRESS FOR LESS')
-            shop_address = shop_info.get('address', 'City center, Naikkanal, Thrissur, Kerala 680001')
+            shop_name, shop_tagline, shop_address = self._get_shop_header()
             
             # Format date
-            bill_date = datetime.strptime(bill_details['created_at'], '%Y-%m-%d %H:%M:%S').strftime('%d/%m/%Y')
-            
-            # Create carbon printer optimized bill content
-            bill_content = []
-            
-            # Header - centered and bold for carbon printer
-            bill_content.append("=" * 50)
-            bill_content.append(f"        {shop_name.upper()}")
-            bill_content.append(f"      {shop_tagline.upper()}")
-            bill_content.append(f"    {shop_address}")
-            bill_content.append("=" * 50)
-            bill_content.append("")
-            
-            # Bill info
-            bill_content.append(f"Date: {bill_date:<20} Bill No: {bill_details['bill_number']}")
-            bill_content.append("-" * 50)
-            bill_content.append("")
-            
-            # Items table - simple format for carbon printer
-            bill_content.append("ITEM NAME                QTY   PRICE    TOTAL")
-            bill_content.append("-" * 50)
+            bill_date = _format_bill_date(bill_details['created_at'])
             
-            for item in bill_details['items']:
-                # Truncate long item names for carbon printer
-                item_name = item['item_name'][:20] if len(item['item_name']) > 20 else item['item_name']
-                bill_content.append(f"{item_name:<20} {item['quantity']:>3}  Rs.{item['unit_price']:>6.2f}  Rs.{item['total_price']:>6.2f}")
-            
-            bill_content.append("-" * 50)
-            bill_content.append(f"{'TOTAL:':<40} Rs.{bill_details['total_amount']:>6.2f}")
-            bill_content.append("")
-            
-            # Payment method
-            bill_content.append(f"Payment Method: {bill_details['payment_method'].upper()}")
-            bill_content.append("")
-            bill_content.append("Thank you for shopping with us!")
-            bill_content.append("Visit again soon!")
-            bill_content.append("")
-            bill_content.append("=" * 50)
+            # Create carbon printer optimized bill content from the fixed layout
+            bill_content = [_CARBON_HEADER % (shop_name, shop_tagline, shop_address, bill_date, bill_details['bill_number'])]
+            bill_content.extend([
+                _CARBON_ITEM_LINE % (item['item_name'], item['quantity'], item['unit_price'], item['total_price'])
+                for item in bill_details['items']
+            ])
+            bill_content.append(_CARBON_FOOTER % (bill_details['total_amount'], bill_details['payment_method'].upper()))
             
             # Write to file
             with open(txt_path, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(bill_content))
+                f.write(''.join(bill_content))
             
             print(f"Carbon printer bill generated: {txt_path}")
             return txt_path
@@ -266,22 +412,20 @@ class BillGenerator:
             system = platform.system()
             
             if system == "Windows":
-                # Windows - use copy command for carbon printers
-                if printer_name:
-                    # Print to specific printer
-                    cmd = f'copy "{bill_path}" "{printer_name}"'
-                else:
-                    # Print to default printer (usually LPT1 for carbon printers)
-                    cmd = f'copy "{bill_path}" LPT1'
-                
-                result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+                # Windows - write the bill straight to the printer port or share,
+                # as `copy` would, without starting cmd.exe
+                # Default printer is usually LPT1 for carbon printers
+                port = printer_name or "LPT1"
                 
-                if result.returncode == 0:
-                    print("Successfully printed to carbon printer")
-                    return True
-                else:
-                    print(f"Print error: {result.stderr}")
+                try:
+                    with open(bill_path, 'rb') as src, open(port, 'wb') as printer:
+                        printer.write(src.read())
+                except OSError as e:
+                    print(f"Print error: {e}")
                     return False
+                
+                print("Successfully printed to carbon printer")
+                return True
                     
             elif system == "Linux":
                 # Linux - use lp command
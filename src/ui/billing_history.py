@@ -4,22 +4,63 @@ Billing History Window for DROP Clothing Shop Billing Application
 Displays billing history with filtering and download options
 """
 
+import calendar
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
+from itertools import chain
 import os
+import queue
+import threading
 import webbrowser
 
 from src.database.database_manager import DatabaseManager
 from src.config.config import Config
+from src.utils.date_utils import parse_timestamp, split_timestamp
+
+# Formats an amount for the tables; %-formatting skips the format-spec parsing f-strings do per call
+_format_rupees = "₹%.2f".__mod__
+
+# Calendar picker layout, with weeks starting on Monday
+_MONDAY_FIRST_CALENDAR = calendar.Calendar(firstweekday=0)
+
+def _with_year_month(date: datetime, year: int, month: int) -> datetime:
+    """Move a date to another month, keeping the day where that month is long enough"""
+    return date.replace(year=year, month=month, day=min(date.day, calendar.monthrange(year, month)[1]))
 
 class BillingHistoryWindow(ttk.Frame):
+    # Bills fetched per page as the table is scrolled
+    PAGE_SIZE = 200
+    
     def __init__(self, parent, db_manager: DatabaseManager, config: Config):
         super().__init__(parent)
         self.db_manager = db_manager
         self.config = config
         
+        # Bill details as of db_manager.bills_version; saved bills never change,
+        # so these are only dropped when bills are added or cleared
+        self._cache_version = -1
+        self._bill_details_cache: Dict[int, Dict] = {}
+        
+        # Date range shown, (created_at, id) of the last bill loaded and whether more remain
+        self._page_range = None
+        self._page_after = None
+        self._has_more_bills = False
+        self._page_pending = False
+        
+        # A background bills load is running / another load was requested meanwhile
+        self._bills_loading = False
+        self._bills_reload = False
+        # Finished bills loads, handed from the worker thread to the Tk thread
+        self._bills_results = queue.Queue()
+        
+        # Screen size used to center dialogs, read from Tk on first use
+        self._screen_size = None
+        
+        # Bill details window, built on first use and reused afterwards
+        self._details_win = None
+        
         self.create_widgets()
         self.load_bills()
     
@@ -135,11 +176,11 @@ class BillingHistoryWindow(ttk.Frame):
             self.bills_tree.column(col, width=column_widths.get(col, 100))
         
         # Add scrollbar
-        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.bills_tree.yview)
-        self.bills_tree.configure(yscrollcommand=scrollbar.set)
+        self.bills_scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.bills_tree.yview)
+        self.bills_tree.configure(yscrollcommand=self.on_bills_scroll)
         
         self.bills_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.bills_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
         # Bind double-click event
         self.bills_tree.bind('<Double-1>', self.view_bill_details)
@@ -163,45 +204,144 @@ class BillingHistoryWindow(ttk.Frame):
     def load_bills(self):
         """Load bills from database"""
         try:
-            # Clear existing items
-            for item in self.bills_tree.get_children():
-                self.bills_tree.delete(item)
-            
             # Get date range
             from_date = self.from_date_var.get()
             to_date = self.to_date_var.get()
             
-            # Get bills from database
-            bills = self.db_manager.get_bills_by_date_range(from_date, to_date)
+            # Only one load runs at a time; a filter change meanwhile reloads once it finishes
+            if self._bills_loading:
+                self._bills_reload = True
+                return
             
-            total_amount = 0
+            # Query off the Tk thread so the window stays responsive
+            self._bills_loading = True
+            threading.Thread(
+                target=self._load_bills_worker,
+                args=(from_date, to_date),
+                daemon=True
+            ).start()
+            self.after(50, self._poll_bills_load)
             
-            # Add bills to treeview
-            for bill in bills:
-                # Parse datetime
-                bill_datetime = datetime.strptime(bill['created_at'], '%Y-%m-%d %H:%M:%S')
-                date_str = bill_datetime.strftime('%d/%m/%Y')
-                time_str = bill_datetime.strftime('%H:%M')
-                
-                # Add to tree
-                self.bills_tree.insert("", "end", values=(
-                    bill['bill_number'],
-                    date_str,
-                    time_str,
-                    f"₹{bill['total_amount']:.2f}",
-                    bill['payment_method'].upper(),
-                    bill['staff_username'],
-                    "View Details"
-                ), tags=(bill['id'],))
-                
-                total_amount += bill['total_amount']
+        except Exception as e:
+            self._bills_loading = False
+            messagebox.showerror("Error", f"Failed to load bills: {str(e)}")
+    
+    def _load_bills_worker(self, from_date: str, to_date: str):
+        """Fetch the first page of bills and the range totals off the Tk thread"""
+        result = None
+        try:
+            bills = self.db_manager.get_bills_page(from_date, to_date, None, self.PAGE_SIZE)
+            # SQLite aggregates over the created_at index instead of summing rows in Python
+            total_amount, total_bills = self.db_manager.get_sales_total(from_date, to_date)
+            result = (from_date, to_date, bills, total_bills, total_amount)
+        except Exception as e:
+            result = e
+        finally:
+            # Always report back, even on failure, so the loading flag gets cleared
+            self._bills_results.put(result)
+    
+    def _poll_bills_load(self):
+        """Pick up a finished bills load on the Tk thread, checking again shortly if none is ready"""
+        try:
+            result = self._bills_results.get_nowait()
+        except queue.Empty:
+            self.after(50, self._poll_bills_load)
+            return
+        self._finish_bills_load(result)
+    
+    def _finish_bills_load(self, result):
+        """Show a freshly loaded first page, or reload if the filter changed meanwhile"""
+        self._bills_loading = False
+        if self._bills_reload:
+            self._bills_reload = False
+            self.load_bills()
+            return
+        
+        try:
+            if isinstance(result, Exception):
+                raise result
+            from_date, to_date, bills, total_bills, total_amount = result
+            
+            # Start again from the newest bill; later pages load as the table is scrolled
+            self._page_range = (from_date, to_date)
+            self._show_bills_page(bills, clear=True)
             
             # Update summary
-            self.update_summary(len(bills), total_amount)
+            self.update_summary(total_bills, total_amount)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load bills: {str(e)}")
     
+    def load_next_bills_page(self):
+        """Append the next page of bills to the table"""
+        self._page_pending = False
+        from_date, to_date = self._page_range
+        bills = self.db_manager.get_bills_page(from_date, to_date, self._page_after, self.PAGE_SIZE)
+        self._show_bills_page(bills)
+    
+    def _show_bills_page(self, bills: List, clear: bool = False):
+        """Add a page of bills to the table, replacing the rows shown when clear is set"""
+        # Format all rows before touching the widget; amount and payment come formatted from SQL
+        rows = []
+        for bill in bills:
+            date_str, time_str = split_timestamp(bill['created_at'])
+            rows.append(((
+                bill['bill_number'],
+                date_str,
+                time_str,
+                bill['total_display'],
+                bill['payment_display'],
+                bill['staff_username'],
+                "View Details"
+            ), (bill['id'],)))
+        
+        tree = self.bills_tree
+        if clear:
+            # Clear existing items with a single Tcl call
+            tree.delete(*tree.get_children())
+        insert = tree.insert
+        for values, tags in rows:
+            insert("", "end", values=values, tags=tags)
+        
+        if clear:
+            self._page_after = None
+        if bills:
+            self._page_after = (bills[-1]['created_at'], bills[-1]['id'])
+        self._has_more_bills = len(bills) == self.PAGE_SIZE
+    
+    def on_bills_scroll(self, first: str, last: str):
+        """Update the scrollbar and load the next page once the end of the table comes into view"""
+        self.bills_scrollbar.set(first, last)
+        if self._has_more_bills and not self._page_pending and float(last) >= 0.9:
+            # Insert outside the widget's own redisplay
+            self._page_pending = True
+            self.after_idle(self._load_next_page_safely)
+    
+    def _load_next_page_safely(self):
+        """Load the next page of bills from an idle callback"""
+        try:
+            self.load_next_bills_page()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load bills: {str(e)}")
+    
+    def _get_bill_details(self, bill_id: int) -> Optional[Dict]:
+        """Get bill details, reusing earlier lookups of the same bill"""
+        # Drop cached details if bills have changed since they were loaded
+        version = self.db_manager.bills_version
+        if version != self._cache_version:
+            self._bill_details_cache.clear()
+            self._cache_version = version
+        
+        bill_details = self._bill_details_cache.get(bill_id)
+        if bill_details is None:
+            bill_details = self.db_manager.get_bill_details(bill_id)
+            if bill_details:
+                # Keep at most 256 bills, dropping the oldest lookup first
+                if len(self._bill_details_cache) >= 256:
+                    del self._bill_details_cache[next(iter(self._bill_details_cache))]
+                self._bill_details_cache[bill_id] = bill_details
+        return bill_details
+    
     def filter_bills(self):
         """Filter bills based on date range"""
         try:
@@ -232,7 +372,7 @@ class BillingHistoryWindow(ttk.Frame):
             bill_id = int(self.bills_tree.item(selection[0])['tags'][0])
             
             # Get bill details
-            bill_details = self.db_manager.get_bill_details(bill_id)
+            bill_details = self._get_bill_details(bill_id)
             
             if bill_details:
                 self.show_bill_details_window(bill_details)
@@ -243,73 +383,101 @@ class BillingHistoryWindow(ttk.Frame):
             messagebox.showerror("Error", f"Failed to view bill details: {str(e)}")
     
     def show_bill_details_window(self, bill_details: dict):
-        """Show bill details in a new window"""
+        """Show bill details in the details window"""
         try:
-            # Create new window
-            details_window = tk.Toplevel(self)
-            details_window.title(f"Bill Details - {bill_details['bill_number']}")
-            details_window.geometry("600x500")
-            details_window.resizable(False, False)
-            
-            # Main frame
-            main_frame = ttk.Frame(details_window, padding="20")
-            main_frame.pack(fill=tk.BOTH, expand=True)
-            
-            # Bill header
-            header_frame = ttk.Frame(main_frame)
-            header_frame.pack(fill=tk.X, pady=(0, 20))
+            # The window is built once and refilled for every bill
+            if self._details_win is None or not self._details_win.winfo_exists():
+                self._create_details_window()
             
-            ttk.Label(header_frame, text="DROP", font=("Arial", 20, "bold")).pack()
-            ttk.Label(header_frame, text="DRESS FOR LESS", font=("Arial", 12, "italic")).pack()
-            
-            # Bill info
-            bill_info_frame = ttk.Frame(main_frame)
-            bill_info_frame.pack(fill=tk.X, pady=(0, 20))
-            
-            bill_date = datetime.strptime(bill_details['created_at'], '%Y-%m-%d %H:%M:%S')
-            
-            ttk.Label(bill_info_frame, text=f"Bill Number: {bill_details['bill_number']}").pack(anchor="w")
-            ttk.Label(bill_info_frame, text=f"Date: {bill_date.strftime('%d/%m/%Y %H:%M')}").pack(anchor="w")
-            ttk.Label(bill_info_frame, text=f"Staff: {bill_details['staff_username']}").pack(anchor="w")
-            ttk.Label(bill_info_frame, text=f"Payment: {bill_details['payment_method'].upper()}").pack(anchor="w")
-            
-            # Items table
-            items_frame = ttk.LabelFrame(main_frame, text="Items", padding="10")
-            items_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 20))
+            details_window = self._details_win
+            details_window.title(f"Bill Details - {bill_details['bill_number']}")
             
-            # Create items treeview
-            item_columns = ("Item", "Code", "Qty", "Price", "Total")
-            items_tree = ttk.Treeview(items_frame, columns=item_columns, show="headings", height=8)
+            bill_date = parse_timestamp(bill_details['created_at'])
             
-            for col in item_columns:
-                items_tree.heading(col, text=col)
-                items_tree.column(col, width=100)
+            self._details_number_label.config(text=f"Bill Number: {bill_details['bill_number']}")
+            self._details_date_label.config(text=f"Date: {bill_date.strftime('%d/%m/%Y %H:%M')}")
+            self._details_staff_label.config(text=f"Staff: {bill_details['staff_username']}")
+            self._details_payment_label.config(text=f"Payment: {bill_details['payment_method'].upper()}")
             
-            # Add items
+            # Replace items
+            items_tree = self._details_items_tree
+            items_tree.delete(*items_tree.get_children())
             for item in bill_details['items']:
                 items_tree.insert("", "end", values=(
                     item['item_name'],
                     item['item_code'],
                     item['quantity'],
-                    f"₹{item['unit_price']:.2f}",
-                    f"₹{item['total_price']:.2f}"
+                    _format_rupees(item['unit_price']),
+                    _format_rupees(item['total_price'])
                 ))
             
-            items_tree.pack(fill=tk.BOTH, expand=True)
-            
-            # Total
-            total_frame = ttk.Frame(main_frame)
-            total_frame.pack(fill=tk.X)
-            
-            ttk.Label(total_frame, text=f"TOTAL: ₹{bill_details['total_amount']:.2f}", 
-                     font=("Arial", 14, "bold")).pack(side=tk.RIGHT)
+            self._details_total_label.config(text=f"TOTAL: ₹{bill_details['total_amount']:.2f}")
             
-            # Close button
-            ttk.Button(main_frame, text="Close", command=details_window.destroy).pack(pady=(10, 0))
+            details_window.deiconify()
+            details_window.lift()
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to show bill details: {str(e)}")
     
+    def _create_details_window(self):
+        """Build the bill details window and its static widgets"""
+        # Create window; closing it only hides it so it can be reused
+        details_window = tk.Toplevel(self)
+        details_window.geometry("600x500")
+        details_window.resizable(False, False)
+        details_window.protocol("WM_DELETE_WINDOW", details_window.withdraw)
+        
+        # Main frame
+        main_frame = ttk.Frame(details_window, padding="20")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Bill header
+        header_frame = ttk.Frame(main_frame)
+        header_frame.pack(fill=tk.X, pady=(0, 20))
+        
+        ttk.Label(header_frame, text="DROP", font=("Arial", 20, "bold")).pack()
+        ttk.Label(header_frame, text="DRESS FOR LESS", font=("Arial", 12, "italic")).pack()
+        
+        # Bill info, filled in for each bill
+        bill_info_frame = ttk.Frame(main_frame)
+        bill_info_frame.pack(fill=tk.X, pady=(0, 20))
+        
+        self._details_number_label = ttk.Label(bill_info_frame)
+        self._details_number_label.pack(anchor="w")
+        self._details_date_label = ttk.Label(bill_info_frame)
+        self._details_date_label.pack(anchor="w")
+        self._details_staff_label = ttk.Label(bill_info_frame)
+        self._details_staff_label.pack(anchor="w")
+        self._details_payment_label = ttk.Label(bill_info_frame)
+        self._details_payment_label.pack(anchor="w")
+        
+        # Items table
+        items_frame = ttk.LabelFrame(main_frame, text="Items", padding="10")
+        items_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 20))
+        
+        # Create items treeview
+        item_columns = ("Item", "Code", "Qty", "Price", "Total")
+        items_tree = ttk.Treeview(items_frame, columns=item_columns, show="headings", height=8)
+        
+        for col in item_columns:
+            items_tree.heading(col, text=col)
+            items_tree.column(col, width=100)
+        
+        items_tree.pack(fill=tk.BOTH, expand=True)
+        self._details_items_tree = items_tree
+        
+        # Total
+        total_frame = ttk.Frame(main_frame)
+        total_frame.pack(fill=tk.X)
+        
+        self._details_total_label = ttk.Label(total_frame, font=("Arial", 14, "bold"))
+        self._details_total_label.pack(side=tk.RIGHT)
+        
+        # Close button
+        ttk.Button(main_frame, text="Close", command=details_window.withdraw).pack(pady=(10, 0))
+        
+        self._details_win = details_window
+    
     def export_to_csv(self):
         """Export bills to CSV file"""
         try:
@@ -317,10 +485,8 @@ class BillingHistoryWindow(ttk.Frame):
             from_date = self.from_date_var.get()
             to_date = self.to_date_var.get()
             
-            # Get bills
-            bills = self.db_manager.get_bills_by_date_range(from_date, to_date)
-            
-            if not bills:
+            # Cheap count first, so no read is held open while the save dialog is up
+            if self.db_manager.get_sales_total(from_date, to_date)[1] == 0:
                 messagebox.showwarning("Warning", "No bills found to export")
                 return
             
@@ -329,29 +495,36 @@ class BillingHistoryWindow(ttk.Frame):
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".csv",
                 filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
-                initialname=filename
+                initialfile=filename
             )
             
             if file_path:
-                # Write CSV file
-                with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-                    import csv
-                    writer = csv.writer(csvfile)
-                    
-                    # Write header
-                    writer.writerow(['Bill Number', 'Date', 'Time', 'Total Amount', 'Payment Method', 'Staff'])
-                    
-                    # Write data
-                    for bill in bills:
-                        bill_datetime = datetime.strptime(bill['created_at'], '%Y-%m-%d %H:%M:%S')
-                        writer.writerow([
-                            bill['bill_number'],
-                            bill_datetime.strftime('%d/%m/%Y'),
-                            bill_datetime.strftime('%H:%M'),
-                            bill['total_amount'],
-                            bill['payment_method'],
-                            bill['staff_username']
-                        ])
+                # Stream bills in chunks rather than holding the whole range in memory
+                chunks = self.db_manager.yield_bills_by_date_range(from_date, to_date)
+                try:
+                    # Write CSV file through a 1 MB buffer so large exports take few write calls
+                    with open(file_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
+                        import csv
+                        writer = csv.writer(csvfile)
+                        
+                        # Write header
+                        writer.writerow(['Bill Number', 'Date', 'Time', 'Total Amount', 'Payment Method', 'Staff'])
+                        
+                        # Write data, formatting rows as each chunk arrives
+                        bills = chain.from_iterable(chunks)
+                        writer.writerows(
+                            (
+                                bill['bill_number'],
+                                *split_timestamp(bill['created_at']),
+                                bill['total_amount'],
+                                bill['payment_method'],
+                                bill['staff_username']
+                            )
+                            for bill in bills
+                        )
+                finally:
+                    # Hand the reader connection back even if writing failed
+                    chunks.close()
                 
                 messagebox.showinfo("Success", f"Bills exported successfully to {file_path}")
         
@@ -380,10 +553,10 @@ class BillingHistoryWindow(ttk.Frame):
             calendar_window.resizable(False, False)
             calendar_window.configure(bg='#f8f9fa')
             
-            # Center the window
-            calendar_window.update_idletasks()
-            x = (calendar_window.winfo_screenwidth() // 2) - (250)
-            y = (calendar_window.winfo_screenheight() // 2) - (300)
+            # Center the window; its size is fixed, so no layout pass is needed first
+            screen_width, screen_height = self._get_screen_size()
+            x = (screen_width // 2) - (250)
+            y = (screen_height // 2) - (300)
             calendar_window.geometry(f"500x600+{x}+{y}")
             
             # Make window modal
@@ -480,6 +653,12 @@ class BillingHistoryWindow(ttk.Frame):
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open calendar: {str(e)}")
     
+    def _get_screen_size(self) -> tuple:
+        """Get the screen size, asking Tk only the first time"""
+        if self._screen_size is None:
+            self._screen_size = (self.winfo_screenwidth(), self.winfo_screenheight())
+        return self._screen_size
+    
     def create_calendar_widget(self, parent, current_date):
         """Create a professional calendar widget"""
         try:
@@ -573,6 +752,9 @@ class BillingHistoryWindow(ttk.Frame):
             self.cal_grid_frame.pack(fill=tk.X, padx=5, pady=5)
             self.cal_grid_frame.pack_propagate(False)
             
+            # Day buttons are created once here and restyled on month changes
+            self._create_day_buttons()
+            
             # Build initial calendar
             self.build_calendar_grid(current_date)
             
@@ -582,52 +764,75 @@ class BillingHistoryWindow(ttk.Frame):
             print(f"Error creating calendar widget: {e}")
             return tk.Frame(parent, bg='white')
     
+    def _create_day_buttons(self):
+        """Build the calendar's day headers and a 6x7 pool of day buttons, reused for every month"""
+        # Professional day headers with styling
+        day_headers = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+        for i, day in enumerate(day_headers):
+            header_label = tk.Label(
+                self.cal_grid_frame, 
+                text=day, 
+                font=("Segoe UI", 10, "bold"),
+                bg='#ecf0f1',
+                fg='#2c3e50',
+                relief='flat'
+            )
+            header_label.grid(row=0, column=i, sticky='ew', padx=1, pady=1)
+        
+        # Configure grid columns to be equal width
+        for i in range(7):
+            self.cal_grid_frame.grid_columnconfigure(i, weight=1)
+        
+        self._day_btns = []
+        for row in range(1, 7):
+            for col in range(7):
+                day_btn = tk.Button(
+                    self.cal_grid_frame,
+                    font=("Segoe UI", 10),
+                    bd=1,
+                    width=4,
+                    height=2,
+                    cursor='hand2'
+                )
+                day_btn.grid(row=row, column=col, sticky='ew', padx=1, pady=1)
+                
+                # Add hover effects (basic); default_bg is set for each month's day
+                day_btn.default_bg = 'white'
+                day_btn.bind("<Enter>", self._on_day_enter)
+                day_btn.bind("<Leave>", self._on_day_leave)
+                
+                self._day_btns.append(day_btn)
+    
+    def _on_day_enter(self, event):
+        """Highlight a calendar day button under the pointer"""
+        btn = event.widget
+        btn.configure(bg='#e9ecef' if btn.cget('bg') != '#3498db' else '#2980b9')
+    
+    def _on_day_leave(self, event):
+        """Restore a calendar day button's colour once the pointer leaves"""
+        event.widget.configure(bg=event.widget.default_bg)
+    
     def build_calendar_grid(self, date):
-        """Build a professional calendar grid"""
+        """Show a month in the calendar grid"""
         try:
-            # Clear existing grid
-            for widget in self.cal_grid_frame.winfo_children():
-                widget.destroy()
-            
-            # Get first day of month and last day of month properly
             first_day = date.replace(day=1)
-            
-            # Calculate last day of current month properly
-            if date.month == 12:
-                next_month = first_day.replace(year=first_day.year + 1, month=1)
-            else:
-                next_month = first_day.replace(month=first_day.month + 1)
-            
-            last_day = next_month - timedelta(days=1)
-            
-            # Professional day headers with styling
-            day_headers = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-            for i, day in enumerate(day_headers):
-                header_label = tk.Label(
-                    self.cal_grid_frame, 
-                    text=day, 
-                    font=("Segoe UI", 10, "bold"),
-                    bg='#ecf0f1',
-                    fg='#2c3e50',
-                    relief='flat'
-                )
-                header_label.grid(row=0, column=i, sticky='ew', padx=1, pady=1)
-            
-            # Configure grid columns to be equal width
-            for i in range(7):
-                self.cal_grid_frame.grid_columnconfigure(i, weight=1)
-            
-            # Calculate starting position (Monday = 0)
-            start_col = (first_day.weekday()) % 7
-            
-            # Create professional day buttons
-            row = 1
-            col = start_col
-            
-            for day in range(1, last_day.day + 1):
+            today = datetime.now().date()
+            
+            # Day numbers laid out Monday-first, one list per week, 0 outside the month
+            weeks = _MONDAY_FIRST_CALENDAR.monthdayscalendar(date.year, date.month)
+            days = [day for week in weeks for day in week]
+            
+            # Restyle the pooled day buttons; cells outside the month are hidden
+            for index, day_btn in enumerate(self._day_btns):
+                day = days[index] if index < len(days) else 0
+                if not day:
+                    day_btn.configure(text='')
+                    day_btn.grid_remove()
+                    continue
+                
                 day_date = first_day.replace(day=day)
-                is_today = day_date.date() == datetime.now().date()
-                is_weekend = day_date.weekday() >= 5  # Saturday = 5, Sunday = 6
+                is_today = day_date.date() == today
+                is_weekend = index % 7 >= 5  # Saturday = 5, Sunday = 6
                 
                 # Professional button styling
                 if is_today:
@@ -643,32 +848,16 @@ class BillingHistoryWindow(ttk.Frame):
                     btn_fg = '#2c3e50'
                     btn_relief = 'flat'
                 
-                # Create professional day button
-                day_btn = tk.Button(
-                    self.cal_grid_frame,
+                day_btn.configure(
                     text=str(day),
-                    font=("Segoe UI", 10),
                     command=lambda d=day_date: self.select_date(d),
                     bg=btn_bg,
                     fg=btn_fg,
                     relief=btn_relief,
-                    bd=1,
-                    width=4,
-                    height=2,
-                    cursor='hand2'
+                    bd=1
                 )
-                
-                day_btn.grid(row=row, column=col, sticky='ew', padx=1, pady=1)
-                
-                # Add hover effects (basic)
-                day_btn.bind("<Enter>", lambda e, btn=day_btn: btn.configure(bg='#e9ecef' if btn.cget('bg') != '#3498db' else '#2980b9'))
-                day_btn.bind("<Leave>", lambda e, btn=day_btn, orig_bg=btn_bg: btn.configure(bg=orig_bg))
-                
-                # Move to next column
-                col += 1
-                if col > 6:
-                    col = 0
-                    row += 1
+                day_btn.default_bg = btn_bg
+                day_btn.grid()
             
             # Store selected date
             self.selected_calendar_date = None
@@ -685,16 +874,9 @@ class BillingHistoryWindow(ttk.Frame):
             else:
                 base_date = current_date
             
-            if direction == 1:  # Next month
-                if base_date.month == 12:
-                    new_date = base_date.replace(year=base_date.year + 1, month=1)
-                else:
-                    new_date = base_date.replace(month=base_date.month + 1)
-            else:  # Previous month
-                if base_date.month == 1:
-                    new_date = base_date.replace(year=base_date.year - 1, month=12)
-                else:
-                    new_date = base_date.replace(month=base_date.month - 1)
+            # Next or previous month, rolling over the year
+            year, month = divmod(base_date.year * 12 + base_date.month - 1 + direction, 12)
+            new_date = _with_year_month(base_date, year, month + 1)
             
             # Update current calendar date
             self.current_cal_date = new_date
@@ -718,7 +900,7 @@ class BillingHistoryWindow(ttk.Frame):
                 base_date = current_date
             
             # Change year
-            new_date = base_date.replace(year=base_date.year + direction)
+            new_date = _with_year_month(base_date, base_date.year + direction, base_date.month)
             
             # Update current calendar date
             self.current_cal_date = new_date
@@ -751,7 +933,7 @@ class BillingHistoryWindow(ttk.Frame):
             
             if new_year:
                 # Create new date with selected year
-                new_date = current_date.replace(year=new_year)
+                new_date = _with_year_month(current_date, new_year, current_date.month)
                 
                 # Update current calendar date
                 self.current_cal_date = new_date
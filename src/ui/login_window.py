@@ -11,8 +11,9 @@ from src.database.database_manager import DatabaseManager
 from src.config.config import Config
 
 class LoginWindow:
-    def __init__(self, root: tk.Tk, db_manager: DatabaseManager, config: Config):
+    def __init__(self, root: tk.Tk, db_manager: DatabaseManager, config: Config, parent=None):
         self.root = root
+        self.parent = parent if parent is not None else root
         self.db_manager = db_manager
         self.config = config
         self.login_success_callback: Optional[Callable] = None
@@ -38,7 +39,7 @@ class LoginWindow:
     def create_widgets(self):
         """Create login form widgets"""
         # Main frame
-        self.main_frame = ttk.Frame(self.root, padding="20")
+        self.main_frame = ttk.Frame(self.parent, padding="20")
         self.main_frame.pack(fill=tk.BOTH, expand=True)
         
         # Header
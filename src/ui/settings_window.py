@@ -201,6 +201,11 @@ class SettingsWindow(ttk.Frame):
             self.config.set("window_width", width)
             self.config.set("window_height", height)
             
+            # Write the settings out now rather than with the next scheduled flush
+            if not self.config.flush():
+                messagebox.showerror("Error", "Failed to save settings to file")
+                return
+            
             # Save shop information to database
             shop_name = self.shop_name_var.get().strip()
             tagline = self.tagline_var.get().strip()
@@ -6,21 +6,24 @@ Provides billing interface with cart functionality
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Dict
+from typing import Dict, List
 from datetime import datetime
 import os
 
 from src.database.database_manager import DatabaseManager
 from src.config.config import Config
+from src.utils.date_utils import parse_timestamp
 from src.ui.bill_generator import BillGenerator
 
 class StaffDashboard(ttk.Frame):
-    def __init__(self, parent, db_manager: DatabaseManager, config: Config, current_user: Dict):
+    def __init__(self, parent, db_manager: DatabaseManager, config: Config, current_user: Dict, lazy: bool = False):
         super().__init__(parent)
         self.db_manager = db_manager
         self.config = config
         self.current_user = current_user
         self.cart_items = []
+        # When lazy, today's stats are loaded after the widgets have been drawn
+        self.lazy = lazy
         
         # Initialize bill generator
         try:
@@ -422,7 +425,10 @@ class StaffDashboard(ttk.Frame):
             self.barcode_input_buffer = ""
             
             # Initialize stats
-            self.refresh_stats()
+            if self.lazy:
+                self.after_idle(self.refresh_stats)
+            else:
+                self.refresh_stats()
             
             # Focus on barcode entry for immediate scanning
             self.barcode_entry.focus()
@@ -937,9 +943,6 @@ class StaffDashboard(ttk.Frame):
                 foreground="blue"
             )
             
-            # Generate bill number
-            bill_number = self.db_manager.get_next_bill_number()
-            
             # Prepare bill items for database
             bill_items = []
             for item in self.cart_items:
@@ -950,19 +953,15 @@ class StaffDashboard(ttk.Frame):
                     'total_price': item['total_price']
                 })
             
-            # Create bill in database
-            print(f"Saving bill to database: {bill_number}")
-            if self.db_manager.create_bill(
-                bill_number, bill_items, total_amount, payment_method, self.current_user['username']
-            ):
+            # Create bill in database; the bill number is allocated in the same transaction
+            print("Saving bill to database")
+            bill_number = self.db_manager.create_bill(
+                None, bill_items, total_amount, payment_method, self.current_user['username']
+            )
+            if bill_number:
                 print(f"Bill {bill_number} saved to database successfully")
                 # Generate and show bill
-                bill_details = self.db_manager.get_bill_details(
-                    self.db_manager.get_bills_by_date_range(
-                        datetime.now().strftime('%Y-%m-%d'),
-                        datetime.now().strftime('%Y-%m-%d')
-                    )[-1]['id']  # Get the latest bill
-                )
+                bill_details = self.db_manager.get_bill_details_by_number(bill_number)
                 
                 if bill_details:
                     # Check if carbon printer mode is enabled
@@ -993,31 +992,19 @@ class StaffDashboard(ttk.Frame):
                         else:
                             messagebox.showerror("Error", "Bill generated but carbon printer file creation failed")
                     else:
-                        # Generate regular PDF
-                        pdf_path = self.bill_generator.generate_bill_pdf(bill_details)
+                        # The bill is saved, so clear the cart (without confirmation)
+                        self.cart_items = []
+                        self.update_cart_display()
+                        self.remove_item_button.config(state=tk.DISABLED)
                         
-                        if pdf_path:
-                            # Clear cart first (without confirmation)
-                            self.cart_items = []
-                            self.update_cart_display()
-                            self.remove_item_button.config(state=tk.DISABLED)
-                            
-                            # Reset barcode status
-                            self.barcode_status_label.config(
-                                text="Ready to scan barcode...", 
-                                foreground="gray"
-                            )
-                            
-                            # Automatically print and open the bill
-                            self.print_and_open_bill(pdf_path, bill_number, total_amount, payment_method, payment_icon)
-                            
-                            # Refresh stats after bill generation
-                            self.refresh_stats()
-                            
-                            # Focus back to barcode entry for next transaction
-                            self.barcode_entry.focus()
-                        else:
-                            messagebox.showerror("Error", "Bill generated but PDF creation failed")
+                        # Generate regular PDF in the background; it is printed once ready
+                        self.bill_generator.generate_bill_pdf_async(
+                            bill_details,
+                            lambda pdf_path: self.on_bill_pdf_ready(
+                                pdf_path, bill_number, total_amount, payment_method, payment_icon
+                            ),
+                            self
+                        )
                 else:
                     messagebox.showerror("Error", "Failed to retrieve bill details")
             else:
@@ -1026,6 +1013,27 @@ class StaffDashboard(ttk.Frame):
         except Exception as e:
             messagebox.showerror("Error", f"Failed to generate bill: {str(e)}")
     
+    def on_bill_pdf_ready(self, pdf_path, bill_number, total_amount, payment_method, payment_icon):
+        """Print and open a bill PDF once its background build has finished"""
+        if not pdf_path:
+            messagebox.showerror("Error", "Bill generated but PDF creation failed")
+            return
+        
+        # Reset barcode status
+        self.barcode_status_label.config(
+            text="Ready to scan barcode...", 
+            foreground="gray"
+        )
+        
+        # Automatically print and open the bill
+        self.print_and_open_bill(pdf_path, bill_number, total_amount, payment_method, payment_icon)
+        
+        # Refresh stats after bill generation
+        self.refresh_stats()
+        
+        # Focus back to barcode entry for next transaction
+        self.barcode_entry.focus()
+    
     def print_and_open_bill(self, pdf_path, bill_number, total_amount, payment_method, payment_icon):
         """Automatically open bill for printing and show success message"""
         try:
@@ -1319,7 +1327,7 @@ Print Error: {str(e)}
         try:
             # Get today's bills
             today = datetime.now().strftime('%Y-%m-%d')
-            bills = self.db_manager.get_bills_by_date_range(today, today)
+            bills = self.db_manager.get_bills_with_items(today, today)
             
             # Calculate stats
             total_bills = len(bills)
@@ -1328,12 +1336,10 @@ Print Error: {str(e)}
             payment_counts = {'cash': 0, 'upi': 0, 'card': 0}
             
             for bill in bills:
-                bill_details = self.db_manager.get_bill_details(bill['id'])
-                if bill_details:
-                    total_items += len(bill_details['items'])
-                    payment_method = bill.get('payment_method', 'cash').lower()
-                    if payment_method in payment_counts:
-                        payment_counts[payment_method] += 1
+                total_items += len(bill['items'])
+                payment_method = bill.get('payment_method', 'cash').lower()
+                if payment_method in payment_counts:
+                    payment_counts[payment_method] += 1
             
             # Update labels
             self.today_bills_label.config(text=f"Bills Today: {total_bills}")
@@ -1346,35 +1352,35 @@ Print Error: {str(e)}
             self.card_count_label.config(text=f"💳 Card: {payment_counts['card']}")
             
             # Update recent transactions
-            self.update_recent_transactions()
+            self.update_recent_transactions(bills)
             
         except Exception as e:
             print(f"Error refreshing stats: {e}")
     
-    def update_recent_transactions(self):
+    def update_recent_transactions(self, bills: List[Dict] = None):
         """Update recent transactions list"""
         try:
             # Clear existing items
             for item in self.recent_tree.get_children():
                 self.recent_tree.delete(item)
             
-            # Get recent bills (last 10)
-            today = datetime.now().strftime('%Y-%m-%d')
-            bills = self.db_manager.get_bills_by_date_range(today, today)
+            # Get recent bills (last 10), unless the caller already has today's bills
+            if bills is None:
+                today = datetime.now().strftime('%Y-%m-%d')
+                bills = self.db_manager.get_bills_with_items(today, today)
             
             # Sort by creation time (most recent first)
-            bills.sort(key=lambda x: x['created_at'], reverse=True)
+            bills = sorted(bills, key=lambda x: x['created_at'], reverse=True)
             
             # Add recent transactions (limit to 10)
             for bill in bills[:10]:
                 # Show date and time to match system time exactly
-                bill_datetime = datetime.strptime(bill['created_at'], '%Y-%m-%d %H:%M:%S')
+                bill_datetime = parse_timestamp(bill['created_at'])
                 time_str = bill_datetime.strftime('%d/%m %H:%M')
                 amount = f"₹{bill['total_amount']:.0f}"
                 
                 # Get item count
-                bill_details = self.db_manager.get_bill_details(bill['id'])
-                item_count = len(bill_details['items']) if bill_details else 0
+                item_count = len(bill['items'])
                 items_str = f"{item_count} items"
                 
                 self.recent_tree.insert("", "end", values=(time_str, amount, items_str))
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Date helpers for DROP Clothing Shop Billing Application
+Parses the timestamps stored in the database
+"""
+
+from datetime import datetime
+from functools import lru_cache
+
+@lru_cache(maxsize=4096)
+def parse_timestamp(value: str) -> datetime:
+    """Parse a 'YYYY-MM-DD HH:MM:SS' database timestamp"""
+    # The database always stores this fixed layout, so slice it instead of running strptime
+    if len(value) == 19:
+        return datetime(int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                        int(value[11:13]), int(value[14:16]), int(value[17:19]))
+    return datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+
+def split_timestamp(value: str) -> tuple:
+    """Split a 'YYYY-MM-DD HH:MM:SS' database timestamp into ('DD/MM/YYYY', 'HH:MM') for display"""
+    if len(value) >= 16:
+        return f"{value[8:10]}/{value[5:7]}/{value[0:4]}", value[11:16]
+    parsed = parse_timestamp(value)
+    return parsed.strftime('%d/%m/%Y'), parsed.strftime('%H:%M')
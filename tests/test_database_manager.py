@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for the DatabaseManager bill numbering, paging and caching
+Run from the project root with: python -m unittest discover -s tests
+"""
+
+import unittest
+from datetime import datetime
+
+from src.database.database_manager import DatabaseManager
+
+
+class DatabaseManagerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseManager(":memory:")
+        self.assertTrue(self.db.initialize_database())
+        self.assertTrue(self.db.add_item("A1", "Shirt", 100.0))
+        self.item = self.db.get_item_by_code("A1")
+        self.today = datetime.now().strftime('%Y-%m-%d')
+
+    def tearDown(self):
+        self.db.close()
+
+    def create_bill(self, payment_method: str = "cash"):
+        """Create a one-item bill, letting the manager number it"""
+        items = [{'item_id': self.item['id'], 'quantity': 1, 'unit_price': 100.0, 'total_price': 100.0}]
+        return self.db.create_bill(None, items, 100.0, payment_method, "staff")
+
+
+class BillNumberTests(DatabaseManagerTestCase):
+    def test_returned_number_is_stored(self):
+        expected = self.db.get_next_bill_number()
+        bill_number = self.create_bill()
+
+        self.assertEqual(bill_number, expected)
+        details = self.db.get_bill_details_by_number(bill_number)
+        self.assertEqual(details['bill_number'], bill_number)
+        self.assertEqual(len(details['items']), 1)
+
+    def test_failed_bill_does_not_advance_counter(self):
+        first = self.create_bill()
+        expected = self.db.get_next_bill_number()
+
+        # The payment method CHECK constraint fails after the number was taken
+        self.assertIsNone(self.create_bill(payment_method="cheque"))
+
+        self.assertEqual(self.db.get_next_bill_number(), expected)
+        second = self.create_bill()
+        self.assertEqual(second, expected)
+        self.assertNotEqual(first, second)
+
+
+class BillsPageTests(DatabaseManagerTestCase):
+    def test_paging_returns_every_bill_once(self):
+        # Bills created within the same second share created_at, so ties on it are paged by id
+        bill_numbers = {self.create_bill() for _ in range(23)}
+
+        seen = []
+        after = None
+        while True:
+            page = self.db.get_bills_page(self.today, self.today, after, limit=5)
+            if not page:
+                break
+            seen.extend(bill['bill_number'] for bill in page)
+            after = (page[-1]['created_at'], page[-1]['id'])
+
+        self.assertEqual(len(seen), len(bill_numbers))
+        self.assertEqual(set(seen), bill_numbers)
+
+
+class BillsRangeCacheTests(DatabaseManagerTestCase):
+    def test_create_bill_invalidates_cached_range(self):
+        self.create_bill()
+        self.assertEqual(len(self.db.get_bills_by_date_range(self.today, self.today)), 1)
+
+        self.create_bill()
+        self.assertEqual(len(self.db.get_bills_by_date_range(self.today, self.today)), 2)
+
+    def test_clear_bills_invalidates_cached_range(self):
+        self.create_bill()
+        self.assertEqual(len(self.db.get_bills_by_date_range(self.today, self.today)), 1)
+
+        self.assertTrue(self.db.clear_bills())
+        self.assertEqual(len(self.db.get_bills_by_date_range(self.today, self.today)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()